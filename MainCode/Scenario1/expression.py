@@ -0,0 +1,148 @@
+"""Safe arithmetic expressions for the calculator.
+
+Expressions are parsed with `ast` and compiled into plain Python closures, but
+only numbers, variables, + - * / // % **, unary signs and a few math
+functions are allowed. Everything is evaluated as float, so no huge integers
+and no access to builtins or attributes. Function arity and nesting depth are
+checked when compiling, and operations that would leave the real numbers (like
+(-4) ** 0.5) raise ValueError. Compiled expressions are kept in an LRU cache
+keyed by their source text.
+"""
+import ast
+import math
+import operator
+from functools import lru_cache
+
+MAX_EXPRESSION_LENGTH = 1000
+MAX_EXPRESSION_DEPTH = 100
+
+
+def _power(base: float, exponent: float) -> float:
+    result = base ** exponent
+    if isinstance(result, complex):
+        raise ValueError("Result is not a real number.")
+    return result
+
+
+def _round(value: float, ndigits: float | None = None) -> float:
+    if ndigits is None:
+        return round(value)
+    if not float(ndigits).is_integer():
+        raise ValueError("round() needs a whole number of digits.")
+    return round(value, int(ndigits))
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: _power,
+}
+
+UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+FUNCTIONS = {
+    "abs": abs,
+    "min": min,
+    "max": max,
+    "round": _round,
+    "sqrt": math.sqrt,
+    "exp": math.exp,
+    "log": math.log,
+    "log10": math.log10,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "floor": math.floor,
+    "ceil": math.ceil,
+}
+
+# (fewest, most) arguments each function takes; None means no upper bound.
+ARITY = {
+    "min": (2, None),
+    "max": (2, None),
+    "round": (1, 2),
+    "log": (1, 2),
+}
+
+CONSTANTS = {
+    "pi": math.pi,
+    "e": math.e,
+}
+
+
+class CompiledExpression:
+    __slots__ = ("source", "variables", "_evaluate")
+
+    def __init__(self, source: str, variables: frozenset[str], evaluate):
+        self.source = source
+        self.variables = variables
+        self._evaluate = evaluate
+
+    def __call__(self, values: dict[str, float]) -> float:
+        missing = self.variables - values.keys()
+        if missing:
+            raise ValueError(f"Missing value for variable(s): {', '.join(sorted(missing))}.")
+        return float(self._evaluate(values))
+
+
+@lru_cache(maxsize=256)
+def compile_expression(source: str) -> CompiledExpression:
+    """Compile `source` once; later calls with the same text reuse the result."""
+    if len(source) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"Expression is longer than {MAX_EXPRESSION_LENGTH} characters.")
+    try:
+        tree = ast.parse(source.strip(), mode="eval")
+    except SyntaxError as exc:
+        raise ValueError(f"Invalid expression: {exc.msg}.") from None
+    variables: set[str] = set()
+    evaluate = _compile(tree.body, variables, 0)
+    return CompiledExpression(source, frozenset(variables), evaluate)
+
+
+def _compile(node: ast.AST, variables: set[str], depth: int):
+    if depth > MAX_EXPRESSION_DEPTH:
+        raise ValueError(f"Expression is nested more than {MAX_EXPRESSION_DEPTH} levels deep.")
+    depth += 1
+
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        value = float(node.value)
+        return lambda values: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in CONSTANTS:
+            value = CONSTANTS[name]
+            return lambda values: value
+        if name in FUNCTIONS:
+            raise ValueError(f"{name} is a function; call it like {name}(x).")
+        variables.add(name)
+        return lambda values: float(values[name])
+
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+        op = BINARY_OPERATORS[type(node.op)]
+        left = _compile(node.left, variables, depth)
+        right = _compile(node.right, variables, depth)
+        return lambda values: op(left(values), right(values))
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+        op = UNARY_OPERATORS[type(node.op)]
+        operand = _compile(node.operand, variables, depth)
+        return lambda values: op(operand(values))
+
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS and not node.keywords:
+        name = node.func.id
+        fewest, most = ARITY.get(name, (1, 1))
+        if len(node.args) < fewest or (most is not None and len(node.args) > most):
+            expected = str(fewest) if fewest == most else f"{fewest} or more" if most is None else f"{fewest} to {most}"
+            raise ValueError(f"{name}() takes {expected} argument(s), got {len(node.args)}.")
+        function = FUNCTIONS[name]
+        args = [_compile(arg, variables, depth) for arg in node.args]
+        return lambda values: function(*(arg(values) for arg in args))
+
+    raise ValueError(f"Unsupported syntax in expression: {ast.unparse(node)!r}.")
@@ -1,9 +1,22 @@
 #libraries
+import math
+import sys
+from pathlib import Path
+from typing import Literal
+
 from fastmcp import FastMCP
 
+from expression import compile_expression
+
+# The tool cache lives next to the deployed server; share it instead of copying it.
+# Appended, not prepended, so nothing in deployment/ can shadow an installed package.
+sys.path.append(str(Path(__file__).resolve().parent.parent / "deployment"))
+from tool_cache import cached_tool
+
 mcp = FastMCP(name = "Calculator")
 
 @mcp.tool()
+@cached_tool
 def multiply(a: float, b: float) -> float:
     """Multiply two numbers.
 
@@ -19,6 +32,7 @@ def multiply(a: float, b: float) -> float:
     description = "Add two numbers.",
     tags = {"math", "arithmetic"}
 )
+@cached_tool(name="add")
 def add_numbers(x: float, y: float) -> float:
     """Add two numbers.
 
@@ -30,6 +44,7 @@ def add_numbers(x: float, y: float) -> float:
     return x + y
 
 @mcp.tool()
+@cached_tool
 def subtract(a: float, b: float) -> float:
     """Subtract two numbers.
 
@@ -41,6 +56,7 @@ def subtract(a: float, b: float) -> float:
     return a - b
 
 @mcp.tool()
+@cached_tool
 def divide(a: float, b: float) -> float:
     """Divide two numbers.
 
@@ -53,5 +69,92 @@ def divide(a: float, b: float) -> float:
         raise ValueError("Cannot divide by zero.")
     return a / b
 
+# NumPy ufunc names; numpy itself is imported on the first batch so startup stays fast.
+BATCH_OPERATIONS = ("add", "subtract", "multiply", "divide")
+
+@mcp.tool(tags = {"math", "arithmetic"})
+def evaluate_batch(
+    operations: list[Literal["add", "subtract", "multiply", "divide"]],
+    a: list[float],
+    b: list[float],
+) -> dict:
+    """Evaluate many arithmetic operations in one call.
+
+    args: operations (list[str]): The operation for each element, or a single
+                                  operation applied to every element.
+          a (list[float]): The first operands.
+          b (list[float]): The second operands.
+
+    returns: dict: "results" holds one value per element (null where it failed)
+                   and "errors" lists the index and message of each failure,
+                   e.g. division by zero or overflow, without failing the whole batch.
+    """
+    import numpy as np
+
+    a_values = np.asarray(a, dtype=np.float64)
+    b_values = np.asarray(b, dtype=np.float64)
+    if a_values.shape != b_values.shape:
+        raise ValueError("a and b must have the same length.")
+    ops = np.asarray(operations)
+    if ops.size == 1:
+        ops = np.full(a_values.shape, ops.item())
+    elif ops.shape != a_values.shape:
+        raise ValueError("operations must have one entry per element, or exactly one.")
+
+    results = np.empty_like(a_values)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for name in BATCH_OPERATIONS:
+            mask = ops == name
+            if mask.any():
+                results[mask] = getattr(np, name)(a_values[mask], b_values[mask])
+
+    divided_by_zero = (ops == "divide") & (b_values == 0)
+    failed = np.flatnonzero(divided_by_zero | ~np.isfinite(results))
+    values = results.tolist()
+    errors = []
+    for index in failed.tolist():
+        values[index] = None
+        error = "Cannot divide by zero." if divided_by_zero[index] else "Result is too large."
+        errors.append({"index": index, "error": error})
+    return {"results": values, "errors": errors}
+
+# Not cached_tool: batches rarely repeat, and compile_expression already caches the parsed expression.
+@mcp.tool(tags = {"math", "arithmetic"})
+def evaluate_expression(expression: str, bindings: list[dict[str, float]] | None = None) -> dict:
+    """Evaluate an arithmetic expression, optionally once per set of variable values.
+
+    args: expression (str): e.g. "(price * qty) * (1 + tax) / 2". Supports
+                            + - * / // % **, parentheses, pi, e and abs, min,
+                            max, round, sqrt, exp, log, log10, sin, cos, tan,
+                            floor, ceil.
+          bindings (list[dict]): Variable values, one dict per evaluation,
+                                 e.g. [{"price": 2, "qty": 3, "tax": 0.1}].
+
+    returns: dict: "results" holds one value per binding (null where it failed)
+                   and "errors" lists the index and message of each failure.
+    """
+    compiled = compile_expression(expression)
+    results, errors = [], []
+    for index, values in enumerate(bindings or [{}]):
+        try:
+            result = compiled(values)
+        except ZeroDivisionError:
+            results.append(None)
+            errors.append({"index": index, "error": "Cannot divide by zero."})
+        except OverflowError:
+            results.append(None)
+            errors.append({"index": index, "error": "Result is too large."})
+        except (ArithmeticError, ValueError, TypeError) as exc:
+            results.append(None)
+            errors.append({"index": index, "error": str(exc)})
+        else:
+            # inf and nan aren't valid JSON, so they are reported like the failures above.
+            if math.isfinite(result):
+                results.append(result)
+            else:
+                results.append(None)
+                errors.append({"index": index, "error": "Result is too large." if math.isinf(result) else "Result is not a number."})
+    return {"results": results, "errors": errors}
+
 if __name__ == "__main__":
     mcp.run() #STDIO by default
@@ -1,6 +1,11 @@
 #HTTP
-from fastapi import FastAPI
+import base64
+import binascii
+
+import numpy as np
+from fastapi import FastAPI, HTTPException
 from fastapi_mcp import FastApiMCP
+from pydantic import BaseModel, Field
 
 #1. Let's make a FastAPI app (that means API) first
 
@@ -37,6 +42,121 @@ def divide_numbers(a: float, b: float):
     result = a / b
     return {"result": result}
 
+#1b. Array versions: one request computes a whole vector elementwise with NumPy
+
+class ArrayOperands(BaseModel):
+    a: list[float] = Field(description="First operands")
+    b: list[float] = Field(description="Second operands, same length as a")
+
+class Float64Operands(BaseModel):
+    a: str = Field(description="First operands as base64 of little-endian float64 values")
+    b: str = Field(description="Second operands as base64 of little-endian float64 values")
+
+def _arrays(a, b):
+    a, b = np.asarray(a, dtype="<f8"), np.asarray(b, dtype="<f8")
+    if a.shape != b.shape:
+        raise HTTPException(status_code=422, detail="a and b must have the same length.")
+    return a, b
+
+def _decode_f64(operands: Float64Operands):
+    try:
+        a = np.frombuffer(base64.b64decode(operands.a, validate=True), dtype="<f8")
+        b = np.frombuffer(base64.b64decode(operands.b, validate=True), dtype="<f8")
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=422, detail="a and b must be base64 encoded little-endian float64 arrays.")
+    return _arrays(a, b)
+
+def _encode_f64(values):
+    return base64.b64encode(np.ascontiguousarray(values, dtype="<f8").tobytes()).decode("ascii")
+
+def _divide(a, b):
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        result = np.divide(a, b)
+    result[b == 0] = np.nan
+    errors = [{"index": index, "error": "Division by zero is not allowed."} for index in np.flatnonzero(b == 0).tolist()]
+    return result, errors
+
+def _to_json(result, errors=()):
+    # NaN and inf (division by zero, overflow) aren't valid JSON, so they become null and are listed in "errors".
+    finite = np.isfinite(result)
+    listed = {error["index"] for error in errors}
+    errors = list(errors) + [
+        {"index": index, "error": "Result is out of the float64 range."}
+        for index in np.flatnonzero(~finite).tolist()
+        if index not in listed
+    ]
+    values = [value if ok else None for value, ok in zip(result.tolist(), finite.tolist())]
+    return {"result": values, "errors": sorted(errors, key=lambda error: error["index"])}
+
+@app.post("/multiply/array")
+def multiply_arrays(operands: ArrayOperands):
+    """
+    Multiplies two arrays elementwise and returns the results.
+    Results outside the float64 range are null and listed in "errors".
+    """
+    a, b = _arrays(operands.a, operands.b)
+    with np.errstate(over="ignore"):
+        return _to_json(a * b)
+@app.post("/add/array")
+def add_arrays(operands: ArrayOperands):
+    """
+    Adds two arrays elementwise and returns the results.
+    Results outside the float64 range are null and listed in "errors".
+    """
+    a, b = _arrays(operands.a, operands.b)
+    with np.errstate(over="ignore"):
+        return _to_json(a + b)
+@app.post("/subtract/array")
+def subtract_arrays(operands: ArrayOperands):
+    """
+    Subtracts two arrays elementwise and returns the results.
+    Results outside the float64 range are null and listed in "errors".
+    """
+    a, b = _arrays(operands.a, operands.b)
+    with np.errstate(over="ignore"):
+        return _to_json(a - b)
+@app.post("/divide/array")
+def divide_arrays(operands: ArrayOperands):
+    """
+    Divides two arrays elementwise and returns the results.
+    Elements divided by zero, or whose result is outside the float64 range, are null and listed in "errors".
+    """
+    result, errors = _divide(*_arrays(operands.a, operands.b))
+    return _to_json(result, errors)
+
+@app.post("/multiply/f64")
+def multiply_f64(operands: Float64Operands):
+    """
+    Multiplies two base64 little-endian float64 arrays elementwise.
+    Returns the results in the same encoding.
+    """
+    a, b = _decode_f64(operands)
+    return {"result": _encode_f64(a * b)}
+@app.post("/add/f64")
+def add_f64(operands: Float64Operands):
+    """
+    Adds two base64 little-endian float64 arrays elementwise.
+    Returns the results in the same encoding.
+    """
+    a, b = _decode_f64(operands)
+    return {"result": _encode_f64(a + b)}
+@app.post("/subtract/f64")
+def subtract_f64(operands: Float64Operands):
+    """
+    Subtracts two base64 little-endian float64 arrays elementwise.
+    Returns the results in the same encoding.
+    """
+    a, b = _decode_f64(operands)
+    return {"result": _encode_f64(a - b)}
+@app.post("/divide/f64")
+def divide_f64(operands: Float64Operands):
+    """
+    Divides two base64 little-endian float64 arrays elementwise.
+    Returns the results in the same encoding; elements divided by zero are NaN and listed in "errors".
+    """
+    result, errors = _divide(*_decode_f64(operands))
+    return {"result": _encode_f64(result), "errors": errors}
+
 #2. Converting it to MCP
 mcp = FastApiMCP(app, name="Calculator MCP")
 mcp.mount_http()
@@ -0,0 +1,288 @@
+"""Warm feed server behind a Unix socket, plus the stdio shim clients launch.
+
+Stdio MCP servers start fresh for every client session, paying for Python,
+FastMCP and a cold feed fetch each time. Instead, point the client at the shim:
+
+    "FCC-Feed": {"command": "python", "args": ["Scenario3/feed_daemon.py"]}
+
+The shim only imports light standard library modules. It connects to the
+daemon's socket (starting the daemon in the background if it isn't running)
+and pipes stdin and stdout through, so the session is answered by an already warm feed_mcp server
+whose feed cache is kept hot. If the daemon can't be reached, the shim runs
+feed_mcp.py directly.
+
+    python Scenario3/feed_daemon.py serve --workers 2
+
+runs the daemon in the foreground; the workers are pre-forked processes that
+share the listening socket.
+
+The socket lives in $XDG_RUNTIME_DIR, or else in a 0700 directory of the user
+in the temp directory, and the shim only connects to a socket owned by the
+same user. A daemon started by the shim exits after FEED_DAEMON_IDLE_TIMEOUT
+seconds without sessions, so it doesn't keep polling the feeds forever.
+Where there are no Unix sockets (Windows), the shim just runs feed_mcp.py.
+"""
+import argparse
+import os
+import signal
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+FEED_MCP = Path(__file__).resolve().parent / "feed_mcp.py"
+# Without Unix sockets or user ids (Windows), the shim always runs feed_mcp.py itself.
+UNIX_SOCKETS = hasattr(socket, "AF_UNIX") and hasattr(os, "getuid")
+
+
+def _default_socket() -> str:
+    if not UNIX_SOCKETS:
+        return ""
+    directory = os.environ.get("XDG_RUNTIME_DIR") or os.path.join(tempfile.gettempdir(), f"fcc-feed-mcp-{os.getuid()}")
+    return os.path.join(directory, "fcc-feed-mcp.sock")
+
+
+FEED_DAEMON_SOCKET = os.environ.get("FEED_DAEMON_SOCKET") or _default_socket()
+FEED_DAEMON_START_TIMEOUT = float(os.environ.get("FEED_DAEMON_START_TIMEOUT", "10"))
+FEED_DAEMON_IDLE_TIMEOUT = float(os.environ.get("FEED_DAEMON_IDLE_TIMEOUT", "600"))
+
+
+def _private_dir(path: str) -> bool:
+    """Create the socket's directory if needed; True if only this user can create files in it."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.stat(directory)
+    return info.st_uid == os.getuid() and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def _connect(path: str) -> socket.socket | None:
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return None
+    if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+        return None  # never hand a session to someone else's socket
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        return sock
+    except OSError:
+        sock.close()
+        return None
+
+
+# Shim
+
+def _start_daemon(path: str) -> None:
+    subprocess.Popen(
+        [sys.executable, __file__, "serve", "--socket", path, "--idle-timeout", str(FEED_DAEMON_IDLE_TIMEOUT)],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def _pipe(sock: socket.socket) -> None:
+    def upstream():
+        try:
+            while data := os.read(sys.stdin.fileno(), 65536):
+                sock.sendall(data)
+            sock.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+    threading.Thread(target=upstream, daemon=True).start()
+    stdout = sys.stdout.buffer
+    while data := sock.recv(65536):
+        stdout.write(data)
+        stdout.flush()
+
+
+def _run_directly() -> None:
+    command = [sys.executable, str(FEED_MCP)]
+    if os.name == "nt":
+        # execv on Windows starts a new process and exits this one, which the client takes as the server quitting.
+        sys.exit(subprocess.call(command))
+    os.execv(sys.executable, command)
+
+
+def shim(path: str, timeout: float) -> None:
+    if not UNIX_SOCKETS:
+        _run_directly()
+    if not _private_dir(path):
+        print(f"{os.path.dirname(path)} is writable by other users; not using the feed daemon.", file=sys.stderr)
+        _run_directly()
+    sock = _connect(path)
+    if sock is None:
+        _start_daemon(path)
+        deadline = time.monotonic() + timeout
+        while sock is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+            sock = _connect(path)
+    if sock is None:
+        _run_directly()
+    with sock:
+        _pipe(sock)
+
+
+# Daemon; asyncio, FastMCP and feed_mcp are only imported here, keeping the shim fast.
+
+async def _handle(server, reader, writer) -> None:
+    """Run one MCP session over a socket connection, speaking the stdio framing (one JSON message per line)."""
+    import anyio
+    from mcp import types
+    from mcp.server.lowlevel import NotificationOptions
+    from mcp.shared.message import SessionMessage
+
+    read_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_reader = anyio.create_memory_object_stream(0)
+
+    async def read_lines():
+        async with read_writer:
+            while line := await reader.readline():
+                try:
+                    await read_writer.send(SessionMessage(types.JSONRPCMessage.model_validate_json(line)))
+                except anyio.ClosedResourceError:
+                    return
+                except Exception as exc:
+                    await read_writer.send(exc)
+
+    async def write_lines():
+        async with write_reader:
+            async for session_message in write_reader:
+                writer.write(session_message.message.model_dump_json(by_alias=True, exclude_none=True).encode() + b"\n")
+                await writer.drain()
+
+    try:
+        async with anyio.create_task_group() as tasks:
+            tasks.start_soon(read_lines)
+            tasks.start_soon(write_lines)
+            await server.run(read_stream, write_stream, server.create_initialization_options(NotificationOptions(tools_changed=True)))
+            tasks.cancel_scope.cancel()
+    except (ConnectionError, anyio.BrokenResourceError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _keep_warm(feed_mcp) -> None:
+    import asyncio
+
+    urls = (feed_mcp.NEWS_FEED_URL, feed_mcp.YOUTUBE_FEED_URL)
+    while True:
+        await asyncio.gather(*(feed_mcp.feed_cache.refresh(url) for url in urls), return_exceptions=True)
+        await asyncio.sleep(feed_mcp.feed_cache.ttl)
+
+
+async def _serve_socket(sock: socket.socket, idle_timeout: float) -> None:
+    """Serve sessions until `idle_timeout` seconds pass without one (0: forever)."""
+    import asyncio
+
+    import feed_mcp
+
+    server = feed_mcp.mcp._mcp_server
+    sessions = 0
+    last_active = time.monotonic()
+
+    async def handle(reader, writer):
+        nonlocal sessions, last_active
+        sessions += 1
+        try:
+            await _handle(server, reader, writer)
+        finally:
+            sessions -= 1
+            last_active = time.monotonic()
+
+    warm = asyncio.create_task(_keep_warm(feed_mcp))
+    unix_server = await asyncio.start_unix_server(handle, sock=sock)
+    try:
+        async with unix_server:
+            if not idle_timeout:
+                await unix_server.serve_forever()
+            while sessions or time.monotonic() - last_active < idle_timeout:
+                await asyncio.sleep(max(1.0, idle_timeout - (time.monotonic() - last_active)))
+    finally:
+        warm.cancel()
+
+
+def _run_worker(sock: socket.socket, idle_timeout: float) -> None:
+    import asyncio
+
+    asyncio.run(_serve_socket(sock, idle_timeout))
+
+
+def _bind(path: str) -> socket.socket:
+    if not _private_dir(path):
+        sys.exit(f"{os.path.dirname(path)} is writable by other users; choose another --socket")
+    existing = _connect(path)
+    if existing is not None:
+        existing.close()
+        sys.exit(f"A feed daemon is already listening on {path}")
+    if os.path.exists(path):
+        os.unlink(path)  # left over from a daemon that died
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    os.chmod(path, 0o600)
+    sock.listen(128)
+    return sock
+
+
+def _fork_worker(sock: socket.socket, idle_timeout: float) -> int:
+    pid = os.fork()
+    if pid == 0:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        code = 1
+        try:
+            _run_worker(sock, idle_timeout)
+            code = 0  # stopped after being idle
+        finally:
+            os._exit(code)
+    return pid
+
+
+def serve(path: str, workers: int, idle_timeout: float = 0) -> None:
+    sock = _bind(path)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    workers_alive: set[int] = set()
+    try:
+        if workers <= 1:
+            _run_worker(sock, idle_timeout)
+            return
+        workers_alive.update(_fork_worker(sock, idle_timeout) for _ in range(workers))
+        while workers_alive:
+            pid, status = os.wait()
+            workers_alive.discard(pid)
+            if os.waitstatus_to_exitcode(status) != 0:
+                workers_alive.add(_fork_worker(sock, idle_timeout))  # crashed; keep the pool at full size
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in workers_alive:
+            os.kill(pid, signal.SIGTERM)
+        sock.close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", nargs="?", choices=("shim", "serve"), default="shim")
+    parser.add_argument("--socket", default=FEED_DAEMON_SOCKET)
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("FEED_DAEMON_WORKERS", "1")),
+                        help="pre-forked server processes (serve only)")
+    parser.add_argument("--idle-timeout", type=float, default=0,
+                        help="exit after this many seconds without sessions; 0 runs forever (serve only)")
+    args = parser.parse_args(argv)
+    if args.mode == "serve":
+        if not UNIX_SOCKETS or not hasattr(os, "fork"):
+            parser.error("serve needs Unix sockets and fork(); on this platform run feed_mcp.py directly")
+        serve(args.socket, args.workers, args.idle_timeout)
+    else:
+        shim(args.socket, FEED_DAEMON_START_TIMEOUT)
+
+
+if __name__ == "__main__":
+    main()
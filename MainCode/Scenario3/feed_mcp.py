@@ -1,37 +1,53 @@
 from fastmcp import FastMCP
-import feedparser
+import os
+import sys
+from pathlib import Path
+
+# The feed cache lives next to the deployed server; share it instead of copying it.
+# Appended, not prepended, so nothing in deployment/ can shadow an installed package.
+sys.path.append(str(Path(__file__).resolve().parent.parent / "deployment"))
+from feed_cache import FeedCache
+
+NEWS_FEED_URL = os.environ.get("FCC_NEWS_FEED_URL", "https://www.freecodecamp.org/news/rss/")
+YOUTUBE_FEED_URL = os.environ.get("FCC_YOUTUBE_FEED_URL", "https://www.youtube.com/feeds/videos.xml?channel_id=UC8butISFwT-Wl7EV0hUK0BQ")
+
+feed_cache = FeedCache()
 
 mcp = FastMCP(name="FreeCodeCamp Feed Searcher")
 
+def with_staleness(results, url):
+    """Flag results served from the last good copy while the upstream feed is failing."""
+    health = feed_cache.health(url)
+    if health.stale:
+        results.append({"message":"Feed unavailable upstream; results may be out of date.", "stale":True, "error":health.error})
+    return results
+
 @mcp.tool()
-def fcc_news_search(query:str, max_results:int=3):
+async def fcc_news_search(query:str, max_results:int=3):
     """Search FreeCodeCamp news feed via RSS by title/description"""
-    feed = feedparser.parse("https://www.freecodecamp.org/news/rss/")
+    feed = await feed_cache.get(NEWS_FEED_URL)
     results = []
     query_lower = query.lower()
     for entry in feed.entries:
-        title = entry.get("title", "")
-        description = entry.get("description", "")
-        if query_lower in title.lower() or query_lower in description.lower():
-            results.append({"title":title, "url":entry.get("link", "")})
+        if query_lower in entry.title.lower() or query_lower in entry.description.lower():
+            results.append({"title":entry.title, "url":entry.link})
         if len(results) >= max_results:
             break #unlikely to occur
 
-    return results or [{"message":"No results found"}]
+    return with_staleness(results or [{"message":"No results found"}], NEWS_FEED_URL)
 
 @mcp.tool()
-def fcc_youtube_search(query:str, max_results:int=3):
+async def fcc_youtube_search(query:str, max_results:int=3):
     """Search FreeCodeCamp Youtube channnel via RSS by title"""
-    feed = feedparser.parse("https://www.youtube.com/feeds/videos.xml?channel_id=UC8butISFwT-Wl7EV0hUK0BQ")
+    feed = await feed_cache.get(YOUTUBE_FEED_URL)
     results = []
     query_lower = query.lower()
     for entry in feed.entries:
-        title = entry.get("title", "")
-        if query_lower in title.lower():
-            results.append({"title":title, "url":entry.get("link", "")})
+        if query_lower in entry.title.lower():
+            results.append({"title":entry.title, "url":entry.link})
         if len(results) >= max_results:
             break #unlikely to occur
-    return results or [{"message":"No videos found"}]
+    return with_staleness(results or [{"message":"No videos found"}], YOUTUBE_FEED_URL)
 
 @mcp.tool()
 def fcc_secret_message():
@@ -0,0 +1,172 @@
+"""Local HTTP server that serves RSS fixtures, so feed benchmarks run offline.
+
+    python MainCode/benchmark/fixture_server.py --port 8765 --registry /tmp/feeds.json
+    FEED_REGISTRY_PATH=/tmp/feeds.json python MainCode/deployment/feed.py
+
+Routes:
+    /news.xml, /youtube.xml     the fixtures in benchmark/fixtures/
+    /synthetic.xml?entries=N    an RSS feed with N generated entries
+    /faults?delay=S&error_rate=R&status=C
+                                set the injected faults (omitted ones are kept)
+                                and return them as JSON
+
+Every response carries an ETag and honours If-None-Match, like the real feeds.
+To stand in for a slow or failing upstream, feed responses can be delayed by
+`delay` seconds and fail with HTTP `status` for a fraction `error_rate` of
+requests, set server-wide (--delay/--error-rate/--status or /faults) or per
+request with the same query parameters.
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode, urlparse
+from urllib.request import urlopen
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+SYNTHETIC_ITEM = """<item>
+  <title>Synthetic tutorial {i}: {topic} in practice</title>
+  <description><![CDATA[<p>Entry {i} about {topic}, generated for load tests.</p>]]></description>
+  <link>https://example.invalid/news/synthetic-{i}/</link>
+  <guid isPermaLink="false">synthetic-{i}</guid>
+</item>"""
+
+TOPICS = ("python", "javascript", "docker", "sql", "react", "go", "rust", "kubernetes", "css", "git")
+
+
+@lru_cache(maxsize=16)
+def synthetic_feed(entries: int) -> bytes:
+    items = "".join(SYNTHETIC_ITEM.format(i=i, topic=TOPICS[i % len(TOPICS)]) for i in range(entries))
+    return f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>Synthetic</title>{items}</channel></rss>'.encode()
+
+
+class Faults:
+    __slots__ = ("delay", "error_rate", "status")
+
+    def __init__(self, delay: float = 0.0, error_rate: float = 0.0, status: int = 503):
+        self.delay = delay
+        self.error_rate = error_rate
+        self.status = status
+
+    def updated(self, query: dict[str, list[str]]) -> "Faults":
+        """A copy with the delay/error_rate/status given in `query` applied."""
+        return Faults(
+            float(query["delay"][0]) if "delay" in query else self.delay,
+            float(query["error_rate"][0]) if "error_rate" in query else self.error_rate,
+            int(query["status"][0]) if "status" in query else self.status,
+        )
+
+    def as_dict(self) -> dict:
+        return {"delay": self.delay, "error_rate": self.error_rate, "status": self.status}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path == "/faults":
+            self.server.faults = self.server.faults.updated(query)
+            self._send(200, "application/json", json.dumps(self.server.faults.as_dict()).encode())
+            return
+
+        faults = self.server.faults.updated(query)
+        if faults.delay:
+            time.sleep(faults.delay)
+        if faults.error_rate and random.random() < faults.error_rate:
+            self.send_error(faults.status)
+            return
+
+        if url.path == "/synthetic.xml":
+            body = synthetic_feed(int(query.get("entries", ["100"])[0]))
+            content_type = "application/rss+xml"
+        else:
+            path = FIXTURES_DIR / url.path.lstrip("/")
+            if path.parent != FIXTURES_DIR or not path.is_file():
+                self.send_error(404)
+                return
+            body = path.read_bytes()
+            content_type = "application/atom+xml" if b"<feed" in body[:300] else "application/rss+xml"
+
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self._send(200, content_type, body, {"ETag": etag})
+
+    def _send(self, status: int, content_type: str, body: bytes, headers: dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_server(host: str, port: int, faults: Faults | None = None) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), FixtureHandler)
+    server.faults = faults or Faults()
+    return server
+
+
+def start(host: str = "127.0.0.1", port: int = 0, faults: Faults | None = None) -> ThreadingHTTPServer:
+    """Serve the fixtures from a background thread; port 0 picks a free port."""
+    server = create_server(host, port, faults)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def set_faults(base_url: str, **faults) -> dict:
+    """Change the faults injected by a running fixture server, e.g. set_faults(url, delay=3)."""
+    with urlopen(f"{base_url}/faults?{urlencode(faults)}") as response:
+        return json.load(response)
+
+
+def write_registry(path: str, base_url: str) -> None:
+    """Write a feeds.json for the deployed feed server that points at this fixture server."""
+    registry = {
+        "news": {"url": f"{base_url}/news.xml", "fields": ["title", "description"]},
+        "youtube": {"url": f"{base_url}/youtube.xml", "fields": ["title"]},
+    }
+    Path(path).write_text(json.dumps(registry, indent=2), encoding="utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--registry", help="also write a feed registry pointing at this server")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to wait before answering feed requests")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of feed requests that fail")
+    parser.add_argument("--status", type=int, default=503, help="HTTP status of the injected failures")
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, Faults(args.delay, args.error_rate, args.status))
+    base_url = f"http://{args.host}:{server.server_port}"
+    if args.registry:
+        write_registry(args.registry, base_url)
+        print(f"Wrote feed registry to {args.registry}")
+    print(f"Serving RSS fixtures on {base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
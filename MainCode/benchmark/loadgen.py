@@ -0,0 +1,361 @@
+"""Load generator for the MCP servers in MainCode/.
+
+Speaks MCP JSON-RPC over stdio or streamable HTTP, keeps `--concurrency` tool
+calls in flight and reports latency percentiles, throughput and the server's
+CPU and memory use.
+
+    # stdio: the load generator launches the server itself
+    python MainCode/benchmark/loadgen.py stdio --server-cmd "python MainCode/Scenario1/fastmcp_calculator.py" \\
+        --tool add --args '{"x": 1, "y": 2}' --requests 5000 --concurrency 32
+
+    # streamable HTTP against an already running server
+    python MainCode/benchmark/loadgen.py http --url http://localhost:8003/mcp --server-pid 1234 \\
+        --tool multiply --args '{"a": 3, "b": 4}'
+
+    # offline feed benchmark: serve RSS fixtures and point the feed server at them
+    python MainCode/benchmark/loadgen.py http --fixtures --url http://localhost:24242/mcp \\
+        --server-cmd "python MainCode/deployment/feed.py" --tool fcc_news_search --args '{"query": "python"}'
+"""
+import argparse
+import asyncio
+import json
+import os
+import shlex
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+
+try:
+    import psutil
+except ImportError:  # CPU/RSS sampling is skipped without psutil
+    psutil = None
+
+PROTOCOL_VERSION = "2025-06-18"
+CLIENT_INFO = {"name": "fcc-mcp-loadgen", "version": "1.0"}
+
+
+def without_admission_limits(env: dict[str, str], concurrency: int) -> dict[str, str]:
+    """Raise the feed server's admission limits, unless already set, to measure raw throughput rather than the shipped load shedding."""
+    limit = str(max(concurrency, 16))
+    env.setdefault("FEED_MAX_CONCURRENT", limit)
+    env.setdefault("FEED_SESSION_CONCURRENCY", limit)
+    env.setdefault("FEED_TOOL_CONCURRENCY", "")
+    env.setdefault("FEED_QUEUE_SIZE", limit)
+    env.setdefault("FEED_QUEUE_TIMEOUT", "60")
+    return env
+
+
+class McpError(Exception):
+    pass
+
+
+class StdioTransport:
+    """Newline-delimited JSON-RPC over a server subprocess's stdin/stdout."""
+
+    def __init__(self, command: list[str], env: dict[str, str] | None = None):
+        self.command = command
+        self.env = env
+        self.process: asyncio.subprocess.Process | None = None
+        self._pending: dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self._reader: asyncio.Task | None = None
+
+    @property
+    def pid(self) -> int | None:
+        return self.process.pid if self.process else None
+
+    async def start(self) -> None:
+        self.process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env=self.env,
+            limit=2**24,
+        )
+        self._reader = asyncio.create_task(self._read())
+
+    async def request(self, method: str, params: dict | None = None) -> dict:
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[self._next_id] = future
+        await self._send({"jsonrpc": "2.0", "id": self._next_id, "method": method, "params": params or {}})
+        return await future
+
+    async def notify(self, method: str, params: dict | None = None) -> None:
+        await self._send({"jsonrpc": "2.0", "method": method, "params": params or {}})
+
+    async def close(self) -> None:
+        if self.process is None:
+            return
+        self.process.stdin.close()
+        try:
+            await asyncio.wait_for(self.process.wait(), 5)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+        self._reader.cancel()
+
+    async def _send(self, message: dict) -> None:
+        self.process.stdin.write(json.dumps(message).encode() + b"\n")
+        await self.process.stdin.drain()
+
+    async def _read(self) -> None:
+        async for line in self.process.stdout:
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # servers may print banners on stdout
+            future = self._pending.pop(message.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result(message)
+        for future in self._pending.values():
+            future.set_exception(McpError("server exited"))
+
+
+class HttpTransport:
+    """JSON-RPC over MCP streamable HTTP, accepting JSON or SSE responses."""
+
+    def __init__(self, url: str, concurrency: int):
+        self.url = url
+        self.pid = None
+        self.session_id: str | None = None
+        self._next_id = 0
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        self._client = httpx.AsyncClient(timeout=60, limits=limits)
+
+    async def start(self) -> None:
+        pass
+
+    async def request(self, method: str, params: dict | None = None) -> dict:
+        self._next_id += 1
+        request_id = self._next_id
+        response = await self._post({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}})
+        self.session_id = response.headers.get("mcp-session-id", self.session_id)
+        if response.headers.get("content-type", "").startswith("text/event-stream"):
+            for line in response.text.splitlines():
+                if line.startswith("data:"):
+                    message = json.loads(line[5:])
+                    if message.get("id") == request_id:
+                        return message
+            raise McpError(f"no response to request {request_id} in event stream")
+        return response.json()
+
+    async def notify(self, method: str, params: dict | None = None) -> None:
+        await self._post({"jsonrpc": "2.0", "method": method, "params": params or {}})
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    async def _post(self, message: dict) -> httpx.Response:
+        headers = {"Accept": "application/json, text/event-stream", "MCP-Protocol-Version": PROTOCOL_VERSION}
+        if self.session_id:
+            headers["mcp-session-id"] = self.session_id
+        response = await self._client.post(self.url, json=message, headers=headers)
+        response.raise_for_status()
+        return response
+
+
+async def initialize(transport) -> None:
+    reply = await transport.request(
+        "initialize", {"protocolVersion": PROTOCOL_VERSION, "capabilities": {}, "clientInfo": CLIENT_INFO}
+    )
+    if "error" in reply:
+        raise McpError(f"initialize failed: {reply['error']}")
+    await transport.notify("notifications/initialized")
+
+
+async def wait_for_http(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while True:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.2)
+
+
+class ResourceSampler:
+    """Samples a process's CPU and RSS while the benchmark runs."""
+
+    def __init__(self, pid: int | None, interval: float = 0.25):
+        self.process = psutil.Process(pid) if (psutil and pid) else None
+        self.interval = interval
+        self.cpu: list[float] = []
+        self.rss: list[int] = []
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self.process is not None:
+            self.process.cpu_percent()
+            self._task = asyncio.create_task(self._sample())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _sample(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                processes = [self.process, *self.process.children(recursive=True)]
+                self.cpu.append(sum(p.cpu_percent() for p in processes))
+                self.rss.append(sum(p.memory_info().rss for p in processes))
+            except psutil.Error:
+                return
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def run_load(transport, tool: str, arguments: dict, requests: int, concurrency: int) -> tuple[list[float], int, float]:
+    latencies: list[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                reply = await transport.request("tools/call", {"name": tool, "arguments": arguments})
+                if "error" in reply or reply.get("result", {}).get("isError"):
+                    errors += 1
+            except (McpError, httpx.HTTPError):
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def report(args, latencies: list[float], errors: int, elapsed: float, sampler: ResourceSampler) -> dict:
+    ordered = sorted(latencies)
+    result = {
+        "transport": args.transport,
+        "tool": args.tool,
+        "requests": len(latencies),
+        "concurrency": args.concurrency,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(statistics.fmean(ordered) * 1000, 3) if ordered else None,
+            "p50": round(percentile(ordered, 0.50) * 1000, 3),
+            "p95": round(percentile(ordered, 0.95) * 1000, 3),
+            "p99": round(percentile(ordered, 0.99) * 1000, 3),
+            "max": round(ordered[-1] * 1000, 3) if ordered else None,
+        },
+    }
+    if sampler.cpu:
+        result["server"] = {
+            "cpu_percent_mean": round(statistics.fmean(sampler.cpu), 1),
+            "cpu_percent_max": round(max(sampler.cpu), 1),
+            "rss_mib_max": round(max(sampler.rss) / 2**20, 1),
+        }
+    return result
+
+
+def print_report(result: dict) -> None:
+    latency = result["latency_ms"]
+    print(f"{result['transport']} {result['tool']}: {result['requests']} requests, concurrency {result['concurrency']}, {result['errors']} errors")
+    print(f"  throughput  {result['rps']:>10.1f} req/s over {result['elapsed_s']:.2f}s")
+    print(f"  latency ms  p50 {latency['p50']:.2f}  p95 {latency['p95']:.2f}  p99 {latency['p99']:.2f}  max {latency['max']:.2f}")
+    if "server" in result:
+        server = result["server"]
+        print(f"  server      cpu {server['cpu_percent_mean']:.0f}% mean / {server['cpu_percent_max']:.0f}% max, rss {server['rss_mib_max']:.1f} MiB max")
+    elif psutil is None:
+        print("  server      install psutil to sample CPU/RSS")
+
+
+async def benchmark(args) -> dict:
+    env = os.environ.copy()
+    if args.no_admission_limits:
+        env = without_admission_limits(env, args.concurrency)
+    fixtures = None
+    if args.fixtures:
+        import fixture_server
+
+        fixtures = fixture_server.start()
+        registry = os.path.join(tempfile.mkdtemp(prefix="fcc-bench-"), "feeds.json")
+        fixture_server.write_registry(registry, f"http://127.0.0.1:{fixtures.server_port}")
+        env["FEED_REGISTRY_PATH"] = registry
+        env["FEED_ARCHIVE_PATH"] = os.path.join(os.path.dirname(registry), "feed_archive.db")
+        # The Scenario3 stdio server reads its URLs directly.
+        env["FCC_NEWS_FEED_URL"] = f"http://127.0.0.1:{fixtures.server_port}/news.xml"
+        env["FCC_YOUTUBE_FEED_URL"] = f"http://127.0.0.1:{fixtures.server_port}/youtube.xml"
+
+    server = None
+    if args.transport == "stdio":
+        transport = StdioTransport(shlex.split(args.server_cmd), env)
+    else:
+        transport = HttpTransport(args.url, args.concurrency)
+        if args.server_cmd:
+            server = await asyncio.create_subprocess_exec(*shlex.split(args.server_cmd), env=env, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL)
+            await wait_for_http(args.url)
+
+    try:
+        await transport.start()
+        await initialize(transport)
+        arguments = json.loads(args.args)
+        if args.warmup:
+            await run_load(transport, args.tool, arguments, args.warmup, args.concurrency)
+
+        sampler = ResourceSampler(server.pid if server else (args.server_pid or transport.pid))
+        sampler.start()
+        latencies, errors, elapsed = await run_load(transport, args.tool, arguments, args.requests, args.concurrency)
+        await sampler.stop()
+        return report(args, latencies, errors, elapsed, sampler)
+    finally:
+        await transport.close()
+        if server is not None:
+            server.terminate()
+            await server.wait()
+        if fixtures is not None:
+            fixtures.shutdown()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("transport", choices=("stdio", "http"))
+    parser.add_argument("--server-cmd", help="command that starts the server (required for stdio)")
+    parser.add_argument("--server-pid", type=int, help="pid of an already running server to sample CPU/RSS from")
+    parser.add_argument("--url", default="http://localhost:24242/mcp", help="streamable HTTP endpoint")
+    parser.add_argument("--tool", required=True)
+    parser.add_argument("--args", default="{}", help="tool arguments as JSON")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=50, help="untimed calls before measuring")
+    parser.add_argument("--fixtures", action="store_true", help="serve RSS fixtures locally and point the feed servers at them")
+    parser.add_argument("--no-admission-limits", action="store_true",
+                        help="lift the feed server's admission limits for a server launched with --server-cmd")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+    if args.transport == "stdio" and not args.server_cmd:
+        parser.error("stdio needs --server-cmd")
+    return args
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    result = asyncio.run(benchmark(args))
+    if args.json:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(result)
+
+
+if __name__ == "__main__":
+    main()
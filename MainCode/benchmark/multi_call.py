@@ -0,0 +1,122 @@
+"""Round-trips saved by fcc_multi_call on the streamable-http feed server.
+
+Compares fetching news results, YouTube results and the secret message with
+one tools/call POST each against a single fcc_multi_call POST. Each POST can be
+delayed by --rtt-ms to stand in for network latency, since on localhost a
+round-trip costs almost nothing.
+
+    python MainCode/benchmark/multi_call.py --rounds 200 --rtt-ms 40
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fixture_server
+from loadgen import HttpTransport, initialize, wait_for_http
+
+FEED_PY = Path(__file__).resolve().parent.parent / "deployment" / "feed.py"
+
+CALLS = [
+    {"tool": "fcc_news_search", "arguments": {"query": "python"}},
+    {"tool": "fcc_youtube_search", "arguments": {"query": "python"}},
+    {"tool": "fcc_secret_message", "arguments": {}},
+]
+
+
+class DelayedTransport(HttpTransport):
+    """HttpTransport that waits `rtt` seconds before every POST."""
+
+    def __init__(self, url: str, rtt: float):
+        super().__init__(url, concurrency=len(CALLS))
+        self.rtt = rtt
+        self.posts = 0
+
+    async def _post(self, message: dict):
+        self.posts += 1
+        await asyncio.sleep(self.rtt)
+        return await super()._post(message)
+
+
+async def separate(transport) -> None:
+    for call in CALLS:
+        reply = await transport.request("tools/call", {"name": call["tool"], "arguments": call["arguments"]})
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+
+
+async def concurrent(transport) -> None:
+    replies = await asyncio.gather(*(
+        transport.request("tools/call", {"name": call["tool"], "arguments": call["arguments"]}) for call in CALLS
+    ))
+    for reply in replies:
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+
+
+async def multi(transport) -> None:
+    reply = await transport.request("tools/call", {"name": "fcc_multi_call", "arguments": {"calls": CALLS}})
+    if "error" in reply or reply["result"].get("isError"):
+        raise RuntimeError(reply)
+
+
+async def measure(transport, scenario, rounds: int) -> dict:
+    await scenario(transport)  # warm up
+    posts_before = transport.posts
+    latencies = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await scenario(transport)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return {
+        "posts_per_round": (transport.posts - posts_before) / rounds,
+        "mean_ms": statistics.fmean(latencies),
+        "p50_ms": statistics.median(latencies),
+    }
+
+
+async def benchmark(args) -> dict[str, dict]:
+    fixtures = fixture_server.start()
+    workdir = tempfile.mkdtemp(prefix="fcc-multi-")
+    registry = os.path.join(workdir, "feeds.json")
+    fixture_server.write_registry(registry, f"http://127.0.0.1:{fixtures.server_port}")
+    env = dict(os.environ, FEED_REGISTRY_PATH=registry, FEED_ARCHIVE_PATH=os.path.join(workdir, "feed_archive.db"))
+    server = await asyncio.create_subprocess_exec(
+        sys.executable, str(FEED_PY), env=env, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL,
+    )
+    transport = DelayedTransport(args.url, args.rtt_ms / 1000)
+    try:
+        await wait_for_http(args.url)
+        await initialize(transport)
+        return {
+            "separate POSTs": await measure(transport, separate, args.rounds),
+            "concurrent POSTs": await measure(transport, concurrent, args.rounds),
+            "fcc_multi_call": await measure(transport, multi, args.rounds),
+        }
+    finally:
+        await transport.close()
+        server.terminate()
+        await server.wait()
+        fixtures.shutdown()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:24242/mcp")
+    parser.add_argument("--rounds", type=int, default=100)
+    parser.add_argument("--rtt-ms", type=float, default=0.0, help="simulated network round-trip per POST")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(benchmark(args))
+    print(f"{len(CALLS)} tool calls per round, {args.rounds} rounds, {args.rtt_ms:g} ms simulated RTT")
+    print(f"{'':>16}  {'POSTs':>5}  {'mean ms':>8}  {'p50 ms':>8}")
+    for name, result in results.items():
+        print(f"{name:>16}  {result['posts_per_round']:>5.0f}  {result['mean_ms']:>8.2f}  {result['p50_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
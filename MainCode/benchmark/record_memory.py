@@ -0,0 +1,88 @@
+"""Compare the memory held by raw feedparser entries with compact FeedRecords.
+
+    python MainCode/benchmark/record_memory.py --entries 100000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import feedparser
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "deployment"))
+from feed_parse import entry_published
+from feed_records import FeedRecord
+
+ITEM = """<item>
+  <title>How to Build an MCP Server in Python, Part {i}</title>
+  <link>https://www.freecodecamp.org/news/mcp-server-python-{i}/</link>
+  <guid isPermaLink="false">{i:024x}</guid>
+  <dc:creator><![CDATA[Quincy Larson]]></dc:creator>
+  <category><![CDATA[Python]]></category>
+  <category><![CDATA[AI]]></category>
+  <pubDate>Mon, 06 Oct 2025 10:00:00 GMT</pubDate>
+  <description><![CDATA[<p>In this tutorial you'll learn how the Model Context Protocol works and
+  build a server step by step. We cover tools, resources and transports. ({i})</p>]]></description>
+  <content:encoded><![CDATA[<p>{body}</p>]]></content:encoded>
+  <media:content url="https://cdn.freecodecamp.org/news/{i}.png" medium="image"/>
+</item>"""
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:content="http://purl.org/rss/1.0/modules/content/" xmlns:media="http://search.yahoo.com/mrss/">
+<channel><title>freeCodeCamp.org</title>{items}</channel></rss>"""
+
+PAGE_SIZE = 500
+
+
+def deep_size(obj, seen=None) -> int:
+    """Bytes held by `obj` and everything it references, counting shared objects once."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(key, seen) + deep_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_size(getattr(obj, name), seen) for name in obj.__slots__ if hasattr(obj, name))
+    elif hasattr(obj, "__dict__"):
+        size += deep_size(vars(obj), seen)
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=100_000)
+    args = parser.parse_args()
+
+    body = "Lorem ipsum dolor sit amet. " * 40
+    started = time.perf_counter()
+    raw = []
+    for first in range(0, args.entries, PAGE_SIZE):
+        items = "".join(ITEM.format(i=i, body=body) for i in range(first, min(first + PAGE_SIZE, args.entries)))
+        raw.extend(feedparser.parse(FEED.format(items=items)).entries)
+    print(f"parsed {len(raw):,} entries in {time.perf_counter() - started:.1f}s")
+
+    compact = [
+        FeedRecord(
+            entry.get("title", ""),
+            entry.get("description", ""),
+            entry.get("link", ""),
+            entry_published(entry),
+            entry.get("author", ""),
+            tuple(tag["term"] for tag in entry.get("tags", ()) if tag.get("term")),
+        )
+        for entry in raw
+    ]
+
+    raw_bytes = deep_size(raw)
+    compact_bytes = deep_size(compact)
+    print(f"feedparser entries: {raw_bytes / 2**20:8.1f} MiB ({raw_bytes / len(raw):,.0f} B/entry)")
+    print(f"FeedRecord:         {compact_bytes / 2**20:8.1f} MiB ({compact_bytes / len(compact):,.0f} B/entry)")
+    print(f"reduction:          {raw_bytes / compact_bytes:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Startup time of the stdio MCP servers, which clients spawn once per session.
+
+For each server this reports the `python -X importtime` profile of importing it
+(total and the slowest top-level imports) and the wall time from spawning the
+process to the answer to `initialize`. It exits with status 1 when a server is
+over the budget or imports a dependency that should only load on first use, so
+it can run as a CI check.
+
+    python MainCode/benchmark/startup_time.py --budget-ms 1500
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from loadgen import StdioTransport, initialize
+
+MAIN_DIR = Path(__file__).resolve().parent.parent
+
+# name: (script, modules that must not be imported until a tool needs them)
+SERVERS = {
+    "calculator": (MAIN_DIR / "Scenario1" / "fastmcp_calculator.py", ("numpy",)),
+    "feed": (MAIN_DIR / "Scenario3" / "feed_mcp.py", ("feedparser",)),
+}
+
+
+def import_profile(script: Path) -> tuple[float, dict[str, float]]:
+    """Return the import time of `script` in ms and the cumulative ms of every module it pulled in."""
+    code = f"import sys; sys.path.insert(0, {str(script.parent)!r}); import {script.stem}"
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+    modules = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative) / 1000
+    return modules.get(script.stem, 0.0), modules
+
+
+def top_level(modules: dict[str, float], script: Path, count: int) -> list[tuple[str, float]]:
+    roots = {}
+    for name, ms in modules.items():
+        root = name.split(".")[0]
+        if root != script.stem:
+            roots[root] = max(roots.get(root, 0.0), ms)
+    return sorted(roots.items(), key=lambda item: -item[1])[:count]
+
+
+async def handshake_ms(script: Path) -> float:
+    started = time.perf_counter()
+    transport = StdioTransport([sys.executable, str(script)], os.environ.copy())
+    try:
+        await transport.start()
+        await initialize(transport)
+        return (time.perf_counter() - started) * 1000
+    finally:
+        await transport.close()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("servers", nargs="*", default=list(SERVERS), help=f"any of {', '.join(SERVERS)} (default: all)")
+    parser.add_argument("--runs", type=int, default=5, help="spawns per server; the median is reported")
+    parser.add_argument("--budget-ms", type=float, default=float(os.environ.get("STARTUP_BUDGET_MS", "2000")),
+                        help="maximum median spawn-to-initialize time")
+    parser.add_argument("--top", type=int, default=5, help="slowest imports to list")
+    args = parser.parse_args(argv)
+    unknown = set(args.servers) - set(SERVERS)
+    if unknown:
+        parser.error(f"unknown server(s): {', '.join(sorted(unknown))}")
+
+    failures = []
+    for name in args.servers:
+        script, lazy = SERVERS[name]
+        total, modules = import_profile(script)
+        spawns = [asyncio.run(handshake_ms(script)) for _ in range(args.runs)]
+        median = statistics.median(spawns)
+
+        print(f"{name}: import {total:.0f} ms, spawn to initialize {median:.0f} ms (median of {args.runs}, budget {args.budget_ms:.0f} ms)")
+        for module, ms in top_level(modules, script, args.top):
+            print(f"  {ms:>8.1f} ms  {module}")
+
+        if median > args.budget_ms:
+            failures.append(f"{name} took {median:.0f} ms to initialize")
+        eager = [module for module in lazy if module in modules]
+        if eager:
+            failures.append(f"{name} imports {', '.join(eager)} at startup")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
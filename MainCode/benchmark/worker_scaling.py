@@ -0,0 +1,107 @@
+"""Throughput of the feed server as the number of uvicorn workers grows.
+
+Starts the RSS fixture server, then for each worker count launches
+deployment/serve.py against it and drives it with the load generator.
+
+    python MainCode/benchmark/worker_scaling.py --workers 1 2 4 --requests 4000 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+
+import fixture_server
+from loadgen import HttpTransport, initialize, percentile, run_load, wait_for_http, without_admission_limits
+
+SERVE_PY = Path(__file__).resolve().parent.parent / "deployment" / "serve.py"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def measure(workers: int, env: dict[str, str], args) -> dict:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/mcp"
+    server = await asyncio.create_subprocess_exec(
+        sys.executable, str(SERVE_PY), "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+        env=env, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL,
+    )
+    transport = HttpTransport(url, args.concurrency)
+    try:
+        await wait_for_http(url)
+        await initialize(transport)
+        arguments = json.loads(args.args)
+        # Warm every worker: each one loads the archive on its first request.
+        await run_load(transport, args.tool, arguments, args.warmup * workers, args.concurrency)
+        latencies, errors, elapsed = await run_load(transport, args.tool, arguments, args.requests, args.concurrency)
+    finally:
+        await transport.close()
+        server.terminate()
+        await server.wait()
+    ordered = sorted(latencies)
+    return {
+        "workers": workers,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+    }
+
+
+async def benchmark(args) -> list[dict]:
+    fixtures = fixture_server.start()
+    workdir = tempfile.mkdtemp(prefix="fcc-workers-")
+    registry = os.path.join(workdir, "feeds.json")
+    fixture_server.write_registry(registry, f"http://127.0.0.1:{fixtures.server_port}")
+    env = os.environ.copy()
+    if args.no_admission_limits:
+        env = without_admission_limits(env, args.concurrency)
+    env["FEED_REGISTRY_PATH"] = registry
+    env["FEED_ARCHIVE_PATH"] = os.path.join(workdir, "feed_archive.db")
+    try:
+        return [await measure(workers, env, args) for workers in args.workers]
+    finally:
+        fixtures.shutdown()
+
+
+def print_table(results: list[dict]) -> None:
+    baseline = results[0]["rps"] or 1.0
+    print(f"{'workers':>7}  {'req/s':>9}  {'speedup':>7}  {'p50 ms':>8}  {'p99 ms':>8}  {'errors':>6}")
+    for result in results:
+        print(
+            f"{result['workers']:>7}  {result['rps']:>9.1f}  {result['rps'] / baseline:>6.2f}x  "
+            f"{result['p50_ms']:>8.2f}  {result['p99_ms']:>8.2f}  {result['errors']:>6}"
+        )
+    print(f"({os.cpu_count()} CPUs available)")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--tool", default="fcc_search_all")
+    parser.add_argument("--args", default='{"query": "python", "mode": "or"}', help="tool arguments as JSON")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--warmup", type=int, default=50, help="untimed calls per worker before measuring")
+    parser.add_argument("--no-admission-limits", action="store_true", help="lift the feed server's admission limits")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(benchmark(args))
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
+import os
+import time
+
 import streamlit as st
-import requests
-from sseclient import SSEClient
-import httpx
-import uuid
+
+from mcp_client import MCPClient, ResultCache
 
 # MCP server base URL
 MCP_BASE_URL = "http://localhost:24242/mcp"
@@ -14,9 +15,20 @@ TOOLS = {
     "Secret Message": "fcc_secret_message"
 }
 
-# Initialize session ID once per user session
-if "session_id" not in st.session_state:
-    st.session_state.session_id = str(uuid.uuid4())
+# Results are cached across sessions, so repeated searches don't hit the server.
+CHATBOT_CACHE_TTL = float(os.environ.get("CHATBOT_CACHE_TTL", "300"))
+CHATBOT_CACHE_SIZE = int(os.environ.get("CHATBOT_CACHE_SIZE", "256"))
+
+@st.cache_resource
+def result_cache():
+    return ResultCache(ttl=CHATBOT_CACHE_TTL, max_entries=CHATBOT_CACHE_SIZE)
+
+cache = result_cache()
+
+# One pooled client per user session: the handshake and connection setup happen once.
+if "mcp_client" not in st.session_state:
+    st.session_state.mcp_client = MCPClient(MCP_BASE_URL)
+client = st.session_state.mcp_client
 
 # Streamlit UI
 st.title("🧠 FreeCodeCamp Chatbot")
@@ -37,44 +49,30 @@ else:
 if st.button("Run Tool"):
     tool_name = TOOLS[selected_tool]
 
-    # Build payload dynamically
-    payload = {
-        "id": str(uuid.uuid4()),
-        "jsonrpc": "2.0",
-        # "tool": tool_name,
-        "method": tool_name,
-        "session_id": st.session_state.session_id,
-        "params": {
-            "query": "python",
-            "max_results": 3
-        }
-    }
-
-    # if query:
-    #     payload["input"]["query"] = query
-    # if max_results:
-    #     payload["input"]["max_results"] = max_results
-
-    headers = {
-        "Content-Type": "application/json",
-        "Accept": "application/json, text/event-stream",
-        # "X-Session-ID": st.session_state.session_id
-        "x-session-id": st.session_state.session_id
-    }
-
+    st.subheader("🔍 Results")
     try:
-        with httpx.stream("POST", MCP_BASE_URL, headers=headers, json=payload) as response:
-            for line in response.iter_lines():
-                if line:
-                    st.write(line)
-
-        response.raise_for_status()
-        result = response.json()
+        # tools/list is fetched once per session; only send the arguments the tool declares.
+        schemas = {tool["name"]: tool.get("inputSchema", {}) for tool in client.list_tools()}
+        if tool_name not in schemas:
+            raise RuntimeError(f"The server doesn't offer {tool_name}.")
+        accepted = schemas[tool_name].get("properties", {})
+        arguments = {}
+        if "query" in accepted:
+            arguments["query"] = query or ""
+        if "max_results" in accepted and max_results:
+            arguments["max_results"] = max_results
+
+        started = time.perf_counter()
+        hit, result = cache.get(tool_name, arguments)
+        if not hit:
+            result = client.call_tool(tool_name, arguments)
+            cache.put(tool_name, arguments, result)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        st.caption(
+            f"{'Cache hit' if hit else 'Cache miss'} in {elapsed_ms:.1f} ms "
+            f"({cache.hits} hits / {cache.misses} misses, {len(cache)} cached)"
+        )
 
-        session_id = response.headers.get('x-session-id')
-        print(f"Session ID: {session_id}")
-
-        st.subheader("🔍 Results")
         if isinstance(result, list):
             for item in result:
                 if "title" in item and "url" in item:
@@ -90,7 +88,4 @@ if st.button("Run Tool"):
         st.error(f"Error: {e}")
 
 
-# streamlit run chatbot_feed.py -- --debug --mcp_url http://localhost:24242/mcp --default_tool fcc_news_search
-
-# TODO
-# data: {"jsonrpc":"2.0","id":"cf60c73e-c7a7-4abe-afd4-3d9bd6194fd7","error":{"code":-32602,"message":"Invalid request parameters","data":""}}
\ No newline at end of file
+# streamlit run chatbot_feed.py -- --debug --mcp_url http://localhost:24242/mcp --default_tool fcc_news_search
\ No newline at end of file
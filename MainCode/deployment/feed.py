@@ -1,50 +1,382 @@
 from fastmcp import FastMCP, Context
-import feedparser
+from feed_admission import AdmissionMiddleware, LoadShedder
+from feed_archive import FeedArchive
+from feed_cache import FeedCache
+from feed_filters import parse_time
+from feed_metrics import Metrics, MetricsMiddleware
+from feed_poller import FeedPoller
+from feed_registry import FeedSource, load_registry
+from feed_related import RelatedIndex
+from tool_cache import cached_tool, cached_tools
 
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from pydantic import BaseModel
+from starlette.middleware import Middleware as ASGIMiddleware
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from datetime import datetime, timezone
+from typing import Any, Literal, NamedTuple
+import asyncio
+import heapq
+import itertools
+import json
 import logging
+import os
+import time
 logger = logging.getLogger(__name__)
 
+FEED_SEARCH_DEADLINE = float(os.environ.get("FEED_SEARCH_DEADLINE", "2"))
+MAX_MULTI_CALLS = int(os.environ.get("MAX_MULTI_CALLS", "16"))
 
+# Off inside fcc_multi_call, which reports progress per call instead of per feed.
+stream_matches: ContextVar[bool] = ContextVar("stream_matches", default=True)
+
+# Every feed the server knows about; see feeds.json.
+feed_registry = load_registry()
+
+metrics = Metrics()
+metrics.describe("feed_search_seconds", "Time spent searching a feed snapshot, by feed.")
+metrics.describe("feed_snapshot_entries", "Entries in the published snapshot, by feed.")
+metrics.describe("tool_cache_hits", "Calls answered from the tool result cache, by tool.")
+metrics.describe("tool_cache_misses", "Calls that missed the tool result cache, by tool.")
+metrics.describe("tool_cache_entries", "Results held in the tool result cache, by tool.")
+
+# One cache shared by every feed tool, so repeated searches reuse the last fetch.
+feed_cache = FeedCache(
+    metrics=metrics,
+    deadlines={source.url: source.deadline for source in feed_registry.values() if source.deadline},
+    names={source.url: source.name for source in feed_registry.values()},
+)
+feed_archive = FeedArchive()
+feed_poller = FeedPoller(feed_cache, feed_archive, {source.name: source.url for source in feed_registry.values()})
+
+# TF-IDF index over every feed for fcc_related; new snapshot entries are appended to it.
+related_index = RelatedIndex()
+related_synced: dict[str, float] = {}
+related_lock = asyncio.Lock()
+
+# Bounds concurrent tool calls per tool and per client; see feed_admission.py.
+admission = AdmissionMiddleware(metrics)
+load_shedder = ASGIMiddleware(LoadShedder, admission=admission, path="/mcp")
 
 # Attach the middleware when you create your FastMCP instance.
-mcp = FastMCP(name="🚀🚀🚀FreeCodeCamp Feed Searcher", stateless_http=True, log_level="DEBUG")
+mcp = FastMCP(
+    name="🚀🚀🚀FreeCodeCamp Feed Searcher",
+    stateless_http=True,
+    log_level="DEBUG",
+    middleware=[admission, MetricsMiddleware(metrics)],
+)
+
+def create_app():
+    """ASGI app for running the server under uvicorn/gunicorn workers; see serve.py.
+
+    The poller is started and stopped with the app (each worker builds its own),
+    so the feeds are fetched at startup instead of by the first tool call.
+    """
+    app = mcp.http_app(path="/mcp", middleware=[load_shedder])
+    session_lifespan = app.lifespan
+
+    @asynccontextmanager
+    async def worker_lifespan(app):
+        async with session_lifespan(app):
+            feed_poller.start()
+            try:
+                yield
+            finally:
+                await feed_poller.stop()
+                await feed_cache.aclose()
+                feed_archive.close()
+
+    app.router.lifespan_context = worker_lifespan
+    return app
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    """Prometheus scrape endpoint, served next to /mcp.
+
+    Each serve.py worker keeps its own metrics, so every series carries a `worker`
+    label (the process id) and counters from different workers never mix.
+    """
+    for name in feed_registry:
+        metrics.set("feed_snapshot_entries", len(feed_poller.published(name).records), feed=name)
+    for tool, cache in cached_tools.items():
+        info = cache.info()
+        metrics.set("tool_cache_hits", info.hits, tool=tool)
+        metrics.set("tool_cache_misses", info.misses, tool=tool)
+        metrics.set("tool_cache_entries", info.currsize, tool=tool)
+    return PlainTextResponse(metrics.render(worker=str(os.getpid())), media_type="text/plain; version=0.0.4")
+
+class SearchFilter(NamedTuple):
+    since: float | None = None
+    until: float | None = None
+    author: str | None = None
+    tag: str | None = None
+    sort: str = "relevance"
+
+NO_FILTER = SearchFilter()
+
+def _search_filter(since: str | None, until: str | None, author: str | None, tag: str | None, sort: str) -> SearchFilter:
+    return SearchFilter(
+        parse_time(since) if since else None,
+        parse_time(until) if until else None,
+        author or None,
+        tag or None,
+        sort,
+    )
+
+def _newest_first(record) -> tuple:
+    # Sort key: newest first, undated entries last.
+    return (record.published is None, -(record.published or 0.0))
+
+def _iso(timestamp: float | None) -> str | None:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _staleness(feed_name: str) -> dict | None:
+    """Staleness marker for a feed whose upstream is failing, so its results may be out of date."""
+    health = feed_cache.health(feed_registry[feed_name].url)
+    if not health.stale:
+        return None
+    return {"stale": True, "updated": _iso(health.updated_at), "upstream": health.state, "error": health.error}
+
+def _with_staleness(results: list, feed_name: str) -> list:
+    stale = _staleness(feed_name)
+    if stale is None:
+        return results
+    return results + [{"message": f"The {feed_name} feed is unavailable upstream; results may be out of date.", **stale}]
+
+def _match(snapshot, source: FeedSource, query: str, max_results: int, mode: str, search_filter: SearchFilter):
+    candidates = snapshot.filters.select(search_filter.since, search_filter.until, search_filter.author, search_filter.tag)
+    if not query.strip():
+        # No query: list the filtered entries (or the whole feed), newest first.
+        docs = snapshot.filters.recent() if candidates is None else candidates
+        if search_filter.since is None and search_filter.until is None and candidates is not None:
+            docs = sorted(docs, key=lambda doc: _newest_first(snapshot.records[doc]))
+        return [(0.0, doc) for doc in docs[:max_results]]
+
+    docs = None if candidates is None else set(candidates)
+    if search_filter.sort == "recent":
+        matches = snapshot.index.search_scored(query, fields=source.fields, mode=mode, docs=docs)
+        return heapq.nsmallest(max_results, matches, key=lambda match: _newest_first(snapshot.records[match[1]]))
+    return snapshot.index.search_scored(query, fields=source.fields, mode=mode, limit=max_results, docs=docs)
+
+async def _search_scored(source: FeedSource, query: str, max_results: int, mode: str, search_filter: SearchFilter = NO_FILTER):
+    snapshot = await feed_poller.snapshot(source.name)
+    started = time.perf_counter()
+    matches = _match(snapshot, source, query, max_results, mode, search_filter)
+    metrics.observe("feed_search_seconds", time.perf_counter() - started, feed=source.name)
+    return snapshot, [(score, snapshot.records[i]) for score, i in matches]
+
+async def _search(feed_name: str, query: str, max_results: int, mode: str, search_filter: SearchFilter):
+    _, matches = await _search_scored(feed_registry[feed_name], query, max_results, mode, search_filter)
+    return [{"title":record.title, "url":record.url, "published":_iso(record.published)} for _, record in matches]
+
+async def _search_within(source: FeedSource, query: str, max_results: int, mode: str, search_filter: SearchFilter, deadline: float):
+    try:
+        return source, await asyncio.wait_for(_search_scored(source, query, max_results, mode, search_filter), deadline)
+    except Exception as exc:
+        return source, exc
+
+@mcp.tool()
+async def fcc_news_search(
+    query:str,
+    max_results:int=3,
+    mode:Literal["and", "or"]="and",
+    since:str|None=None,
+    until:str|None=None,
+    sort:Literal["relevance", "recent"]="relevance",
+    author:str|None=None,
+    tag:str|None=None,
+):
+    """Search FreeCodeCamp news feed via RSS by title/description.
+
+    Results are ranked by relevance. Words also match as prefixes; with mode="and"
+    every word must match, with mode="or" any of them may.
+
+    `since`/`until` take an ISO date ("2025-01-31") or an age ("7d", "12h", "2w");
+    sort="recent" returns the newest matches first. `author` and `tag` (a post
+    category) match exactly, ignoring case. With an empty query, the newest posts
+    passing the filters are returned. While the upstream feed is failing, results
+    come from the last good copy and end with a {"stale": true} marker.
+    """
+    search_filter = _search_filter(since, until, author, tag, sort)
+    results = await _search("news", query, max_results, mode, search_filter)
+    return _with_staleness(results or [{"message":"No results found"}], "news")
+
+@mcp.tool()
+async def fcc_youtube_search(
+    query:str,
+    max_results:int=3,
+    mode:Literal["and", "or"]="and",
+    since:str|None=None,
+    until:str|None=None,
+    sort:Literal["relevance", "recent"]="relevance",
+):
+    """Search FreeCodeCamp Youtube channnel via RSS by title.
+
+    Results are ranked by relevance. Words also match as prefixes; with mode="and"
+    every word must match, with mode="or" any of them may.
+
+    `since`/`until` take an ISO date ("2025-01-31") or an age ("7d", "12h", "2w");
+    sort="recent" returns the newest matches first, e.g. query="python", since="7d",
+    sort="recent" for this week's Python videos. With an empty query, the newest
+    videos passing the filters are returned. While the upstream feed is failing,
+    results come from the last good copy and end with a {"stale": true} marker.
+    """
+    search_filter = _search_filter(since, until, None, None, sort)
+    results = await _search("youtube", query, max_results, mode, search_filter)
+    return _with_staleness(results or [{"message":"No videos found"}], "youtube")
+
+@mcp.tool()
+async def fcc_search_all(
+    query:str,
+    max_results:int=5,
+    mode:Literal["and", "or"]="and",
+    since:str|None=None,
+    until:str|None=None,
+    sort:Literal["relevance", "recent"]="relevance",
+    deadline:float=FEED_SEARCH_DEADLINE,
+    ctx: Context = None,
+):
+    """Search every registered feed at once and merge the results by relevance.
+
+    Each feed gets `deadline` seconds; slow or failing feeds are left out of the
+    results and reported in `sources` instead of holding up the rest. Clients that
+    send a progress token get each feed's matches as a progress notification as
+    soon as that feed is done, before the merged results. `since`, `until` and
+    sort="recent" work as in fcc_news_search. Feeds answered from a stale copy
+    because their upstream is failing are marked "stale" in `sources`.
+    """
+    search_filter = _search_filter(since, until, None, None, sort)
+    sources = list(feed_registry.values())
+    tasks = [_search_within(source, query, max_results, mode, search_filter, deadline) for source in sources]
+
+    ranked, status = [], {}
+    for done, next_outcome in enumerate(asyncio.as_completed(tasks), 1):
+        source, outcome = await next_outcome
+        matches = []
+        if isinstance(outcome, asyncio.TimeoutError):
+            status[source.name] = {"status": "timeout"}
+        elif isinstance(outcome, Exception):
+            logger.warning("Searching %s failed: %s", source.name, outcome)
+            status[source.name] = {"status": "error", "error": str(outcome)}
+        else:
+            snapshot, matches = outcome
+            status[source.name] = {"status": "ok" if snapshot.records else "unavailable", "matches": len(matches)}
+            status[source.name].update(_staleness(source.name) or {})
+            ranked.append([(score, source.name, record) for score, record in matches])
+        if ctx and stream_matches.get():
+            partial = {
+                "source": source.name,
+                **status[source.name],
+                "results": [
+                    {"title":record.title, "url":record.url, "published":_iso(record.published), "score":round(score, 3)}
+                    for score, record in matches
+                ],
+            }
+            await ctx.report_progress(done, len(sources), json.dumps(partial))
+
+    # Each feed's matches are already in order, so a k-way merge is enough.
+    if search_filter.sort == "recent" or not query.strip():
+        order = lambda match: _newest_first(match[2])
+    else:
+        order = lambda match: -match[0]
+    merged = heapq.merge(*ranked, key=order)
+    results = [
+        {"title":record.title, "url":record.url, "source":name, "published":_iso(record.published), "score":round(score, 3)}
+        for score, name, record in itertools.islice(merged, max_results)
+    ]
+    return {"results": results, "sources": {source.name: status[source.name] for source in sources}}
+
+def _related_items(source: FeedSource, records):
+    for record in records:
+        text = " ".join(
+            getattr(record, "search_" + field) for field in source.fields if field in ("title", "description")
+        )
+        yield record.url, text, (source.name, record)
+
+async def _sync_related() -> None:
+    async with related_lock:
+        for source in feed_registry.values():
+            snapshot = await feed_poller.snapshot(source.name)
+            if related_synced.get(source.name) != snapshot.updated_at:
+                await asyncio.to_thread(related_index.add, _related_items(source, snapshot.records))
+                related_synced[source.name] = snapshot.updated_at
 
 @mcp.tool()
-def fcc_news_search(query:str, max_results:int=3):
-    """Search FreeCodeCamp news feed via RSS by title/description"""
-    feed = feedparser.parse("https://www.freecodecamp.org/news/rss/")
-    results = []
-    query_lower = query.lower()
-    for entry in feed.entries:
-        title = entry.get("title", "")
-        description = entry.get("description", "")
-        if query_lower in title.lower() or query_lower in description.lower():
-            results.append({"title":title, "url":entry.get("link", "")})
-        if len(results) >= max_results:
-            break #unlikely to occur
-
-    return results or [{"message":"No results found"}]
+async def fcc_related(query:str, max_results:int=5):
+    """Find FreeCodeCamp news posts and YouTube videos related to an article URL or free text.
+
+    A URL the server has seen is compared by its own title/description; anything
+    else is treated as text. Results are ranked by TF-IDF cosine similarity.
+    """
+    await _sync_related()
+    matches = related_index.similar(text=query, key=query.strip(), limit=max_results)
+    results = [
+        {"title":record.title, "url":record.url, "source":name, "score":round(score, 3)}
+        for score, (name, record) in matches
+    ]
+    return results or [{"message":"No related posts found"}]
+
+class ToolCall(BaseModel):
+    tool: str
+    arguments: dict[str, Any] = {}
+
+def _tool_output(tool, result) -> Any:
+    if result.structured_content is not None:
+        # FastMCP wraps non-object return values as {"result": value} and flags that in the schema.
+        if tool.output_schema and tool.output_schema.get("x-fastmcp-wrap-result"):
+            return result.structured_content["result"]
+        return result.structured_content
+    text = "\n".join(item.text for item in result.content if item.type == "text")
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+async def _call_one(index: int, call: ToolCall) -> tuple[int, dict]:
+    stream_matches.set(False)
+    try:
+        if call.tool == "fcc_multi_call":
+            raise ValueError("fcc_multi_call can't call itself.")
+        tool = await mcp.get_tool(call.tool)
+        # Goes through the middleware, so each call is admitted and counted in /metrics like a
+        # normal one. _call_tool is private to FastMCP, hence the version pin in requirements.
+        result = await mcp._call_tool(call.tool, call.arguments)
+        return index, {"tool": call.tool, "result": _tool_output(tool, result)}
+    except Exception as exc:
+        return index, {"tool": call.tool, "error": str(exc)}
 
 @mcp.tool()
-def fcc_youtube_search(query:str, max_results:int=3):
-    """Search FreeCodeCamp Youtube channnel via RSS by title"""
-    feed = feedparser.parse("https://www.youtube.com/feeds/videos.xml?channel_id=UC8butISFwT-Wl7EV0hUK0BQ")
-    results = []
-    query_lower = query.lower()
-    for entry in feed.entries:
-        title = entry.get("title", "")
-        if query_lower in title.lower():
-            results.append({"title":title, "url":entry.get("link", "")})
-        if len(results) >= max_results:
-            break #unlikely to occur
-    return results or [{"message":"No videos found"}]
+async def fcc_multi_call(calls: list[ToolCall], ctx: Context = None):
+    """Run several tool calls in one request, e.g. both searches plus the secret message.
+
+    The calls run concurrently and the results come back in the order of `calls`;
+    a failing call gets an "error" instead of failing the others. Clients that send
+    a progress token get each call's result as a progress notification as soon as
+    it finishes (JSON with its "index" in `message`).
+    """
+    if len(calls) > MAX_MULTI_CALLS:
+        raise ValueError(f"At most {MAX_MULTI_CALLS} calls per request.")
+    responses = [None] * len(calls)
+    tasks = [_call_one(index, call) for index, call in enumerate(calls)]
+    for done, next_response in enumerate(asyncio.as_completed(tasks), 1):
+        index, response = await next_response
+        responses[index] = response
+        if ctx:
+            await ctx.report_progress(done, len(calls), json.dumps({"index": index, **response}))
+    return responses
 
 @mcp.tool()
+@cached_tool
 def fcc_secret_message():
     """Returns a secret message of FreeCodeCamp"""
     return "Keep exploring! and happy coding!"
 
 @mcp.tool
+@cached_tool
 def add(a: int, b: int) -> int:
     """Add two numbers"""
     return a + b
@@ -63,10 +395,11 @@ def get_version(ctx: Context):
     return "2.0.1"
 
 if __name__ == "__main__":
-    mcp.run(
-        # transport="http",           # or "websocket"
-        transport="streamable-http",
+    import uvicorn
+
+    # Same app as serve.py, so the poller starts with the server rather than with a session.
+    uvicorn.run(
+        create_app(),
         host="localhost",             # default is "127.0.0.1"
         port=24242,                  # default port
-        path="/mcp",
     )
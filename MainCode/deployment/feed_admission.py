@@ -0,0 +1,272 @@
+"""Admission control and load shedding for the deployed server's tool calls.
+
+Every tool call needs a slot under its client's limit, the server-wide limit
+and its tool's limit. A call that can't get them all waits in a bounded queue
+for at most the queue timeout; when the queue is full or the wait runs out, it
+is rejected straight away with a "server busy" error instead of piling up
+behind slow upstream fetches. LoadShedder answers tools/call POSTs with HTTP
+429 while the queue is full, before they reach an MCP session at all.
+
+The client limit applies per MCP session. The stateless HTTP server issues no
+session ids, so there it only applies when FEED_LIMIT_BY_ADDRESS is set, and
+then every client address (a reverse proxy counts as one) shares its slots.
+"""
+import asyncio
+import json
+import math
+import os
+import time
+from contextvars import ContextVar
+
+from fastmcp.exceptions import ToolError
+from fastmcp.server.dependencies import get_http_request
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from starlette.responses import JSONResponse
+
+FEED_MAX_CONCURRENT = int(os.environ.get("FEED_MAX_CONCURRENT", "16"))
+FEED_SESSION_CONCURRENCY = int(os.environ.get("FEED_SESSION_CONCURRENCY", "4"))
+FEED_TOOL_CONCURRENCY = os.environ.get("FEED_TOOL_CONCURRENCY", "fcc_search_all=4,fcc_related=4")
+FEED_QUEUE_SIZE = int(os.environ.get("FEED_QUEUE_SIZE", "64"))
+FEED_QUEUE_TIMEOUT = float(os.environ.get("FEED_QUEUE_TIMEOUT", "1"))
+FEED_LIMIT_BY_ADDRESS = os.environ.get("FEED_LIMIT_BY_ADDRESS", "") not in ("", "0")
+
+# Set while an admitted call runs. The calls it makes itself (fcc_multi_call) still need their
+# tool's slot, but not another server-wide or client slot, which the outer call already holds.
+# They never wait for it: holding the outer call's server-wide slot while waiting on a tool
+# slot could deadlock with a call that holds that tool slot and waits for a server-wide one.
+_admitted: ContextVar[bool] = ContextVar("_admitted", default=False)
+
+
+def parse_limits(spec: str) -> dict[str, int]:
+    """Parse "tool=limit,tool=limit" into {tool: limit}."""
+    limits = {}
+    for item in spec.split(","):
+        if item.strip():
+            tool, _, limit = item.partition("=")
+            limits[tool.strip()] = int(limit)
+    return limits
+
+
+def _client_key(by_address: bool) -> str | None:
+    """The MCP session id, else the client address if `by_address`; None when calls aren't limited per client."""
+    try:
+        request = get_http_request()
+    except RuntimeError:
+        return None  # stdio or in-process: a single client, covered by the server-wide limit
+    session_id = request.headers.get("mcp-session-id")
+    if session_id:
+        return session_id
+    if by_address and request.client:
+        return request.client.host
+    return None
+
+
+class ServerBusy(ToolError):
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"Server busy ({reason}); retry in {retry_after:g}s.")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _ClientSlots:
+    __slots__ = ("semaphore", "users")
+
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.users = 0
+
+
+class AdmissionMiddleware(Middleware):
+    def __init__(
+        self,
+        metrics=None,
+        max_concurrent: int = FEED_MAX_CONCURRENT,
+        session_concurrency: int = FEED_SESSION_CONCURRENCY,
+        tool_concurrency: dict[str, int] | None = None,
+        queue_size: int = FEED_QUEUE_SIZE,
+        queue_timeout: float = FEED_QUEUE_TIMEOUT,
+        limit_by_address: bool = FEED_LIMIT_BY_ADDRESS,
+    ):
+        self.metrics = metrics
+        self.max_concurrent = max_concurrent
+        self.session_concurrency = session_concurrency
+        self.tool_concurrency = parse_limits(FEED_TOOL_CONCURRENCY) if tool_concurrency is None else tool_concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.limit_by_address = limit_by_address
+        self.active = 0
+        self.waiting = 0
+        self._global = asyncio.Semaphore(max_concurrent)
+        self._tools: dict[str, asyncio.Semaphore] = {}
+        self._clients: dict[str, _ClientSlots] = {}
+        if metrics:
+            metrics.describe("admission_active", "Tool calls admitted and running.")
+            metrics.describe("admission_waiting", "Tool calls queued for a slot, by tool.")
+            metrics.describe("admission_wait_seconds", "Time tool calls spent queued before admission, by tool.")
+            metrics.describe("admission_rejected_total", "Tool calls turned away, by reason.")
+
+    @property
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.queue_timeout))
+
+    @property
+    def queue_full(self) -> bool:
+        return self.waiting >= self.queue_size
+
+    def reject(self, reason: str) -> ServerBusy:
+        self._record("inc", "admission_rejected_total", 1, reason=reason)
+        return ServerBusy(reason, self.retry_after)
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext):
+        tool = context.message.name
+        if _admitted.get():
+            held = await self._admit_nested(tool)
+            try:
+                return await call_next(context)
+            finally:
+                self._release(held, None)
+
+        client = _client_key(self.limit_by_address)
+        held = await self._admit(tool, client)
+        token = _admitted.set(True)
+        self.active += 1
+        self._record("set", "admission_active", self.active)
+        try:
+            return await call_next(context)
+        finally:
+            _admitted.reset(token)
+            self.active -= 1
+            self._record("set", "admission_active", self.active)
+            self._release(held, client)
+
+    def _tool_semaphore(self, tool: str) -> asyncio.Semaphore | None:
+        if tool not in self.tool_concurrency:
+            return None
+        if tool not in self._tools:
+            self._tools[tool] = asyncio.Semaphore(self.tool_concurrency[tool])
+        return self._tools[tool]
+
+    def _semaphores(self, tool: str, client: str | None) -> list[asyncio.Semaphore]:
+        # Top-level calls always acquire in this order, so two of them can't each hold what the
+        # other waits for; nested calls never wait (see _admitted).
+        semaphores = []
+        if client is not None:
+            slots = self._clients.get(client)
+            if slots is None:
+                slots = self._clients[client] = _ClientSlots(self.session_concurrency)
+            slots.users += 1
+            semaphores.append(slots.semaphore)
+        tool_semaphore = self._tool_semaphore(tool)
+        if tool_semaphore is not None:
+            semaphores.append(tool_semaphore)
+        semaphores.append(self._global)
+        return semaphores
+
+    async def _admit_nested(self, tool: str) -> list[asyncio.Semaphore]:
+        semaphore = self._tool_semaphore(tool)
+        if semaphore is None:
+            return []
+        if semaphore.locked():
+            raise self.reject("tool_busy")
+        await semaphore.acquire()  # free, so this returns without waiting
+        return [semaphore]
+
+    async def _admit(self, tool: str, client: str | None) -> list[asyncio.Semaphore]:
+        semaphores = self._semaphores(tool, client)
+        if not any(semaphore.locked() for semaphore in semaphores):
+            for semaphore in semaphores:
+                await semaphore.acquire()  # free, so this returns without waiting
+            return semaphores
+        if self.queue_full:
+            self._release([], client)
+            raise self.reject("queue_full")
+
+        held = []
+        started = time.monotonic()
+        deadline = started + self.queue_timeout
+        self.waiting += 1
+        self._record("add", "admission_waiting", 1, tool=tool)
+        try:
+            for semaphore in semaphores:
+                await asyncio.wait_for(semaphore.acquire(), max(0.0, deadline - time.monotonic()))
+                held.append(semaphore)
+        except asyncio.TimeoutError:
+            self._release(held, client)
+            raise self.reject("queue_timeout") from None
+        except BaseException:
+            self._release(held, client)
+            raise
+        finally:
+            self.waiting -= 1
+            self._record("add", "admission_waiting", -1, tool=tool)
+            self._record("observe", "admission_wait_seconds", time.monotonic() - started, tool=tool)
+        return held
+
+    def _release(self, held: list[asyncio.Semaphore], client: str | None) -> None:
+        for semaphore in held:
+            semaphore.release()
+        if client is None:
+            return
+        slots = self._clients[client]
+        slots.users -= 1
+        if not slots.users:
+            del self._clients[client]
+
+    def _record(self, method: str, name: str, value: float, **labels: str) -> None:
+        if self.metrics:
+            getattr(self.metrics, method)(name, value, **labels)
+
+
+class LoadShedder:
+    """ASGI middleware answering tools/call POSTs with 429 while the admission queue is full."""
+
+    def __init__(self, app, admission: AdmissionMiddleware, path: str = "/mcp"):
+        self.app = app
+        self.admission = admission
+        self.path = path.rstrip("/")
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"].rstrip("/") != self.path
+            or not self.admission.queue_full
+        ):
+            return await self.app(scope, receive, send)
+
+        body, more = b"", True
+        while more:
+            message = await receive()
+            body += message.get("body", b"")
+            more = message.get("more_body", False)
+        try:
+            request = json.loads(body)
+        except ValueError:
+            request = None
+        if not isinstance(request, dict) or request.get("method") != "tools/call":
+            return await self.app(scope, _replay(body, receive), send)
+
+        busy = self.admission.reject("shed")
+        response = JSONResponse(
+            {
+                "jsonrpc": "2.0",
+                "id": request.get("id"),
+                "error": {"code": -32000, "message": str(busy), "data": {"retry_after": busy.retry_after}},
+            },
+            status_code=429,
+            headers={"Retry-After": str(busy.retry_after)},
+        )
+        await response(scope, receive, send)
+
+
+def _replay(body: bytes, receive):
+    sent = False
+
+    async def replayed():
+        nonlocal sent
+        if sent:
+            return await receive()
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return replayed
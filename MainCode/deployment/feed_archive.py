@@ -0,0 +1,112 @@
+"""On-disk archive of every feed entry the server has seen.
+
+RSS only exposes the latest items, so new entries are appended to a SQLite
+database (de-duplicated by GUID, falling back to the link) and searches run
+over the whole archive. On restart the archive is loaded back without touching
+the network. Several server workers can share one archive; `claim` makes sure
+only one of them fetches a feed per poll interval.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+FEED_ARCHIVE_PATH = os.environ.get("FEED_ARCHIVE_PATH", str(Path(__file__).resolve().parent / "feed_archive.db"))
+
+INSERT_BATCH_SIZE = 500
+TAG_SEPARATOR = "\n"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    feed TEXT NOT NULL,
+    key TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    url TEXT NOT NULL,
+    published REAL,
+    archived_at REAL NOT NULL,
+    author TEXT NOT NULL DEFAULT '',
+    tags TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (feed, key)
+);
+CREATE INDEX IF NOT EXISTS entries_by_published ON entries (feed, published DESC);
+CREATE TABLE IF NOT EXISTS polls (
+    feed TEXT PRIMARY KEY,
+    polled_at REAL NOT NULL
+);
+"""
+
+
+class FeedArchive:
+    def __init__(self, path: str = FEED_ARCHIVE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        # Archives created before entries had authors and tags.
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+        for column in ("author", "tags"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE entries ADD COLUMN {column} TEXT NOT NULL DEFAULT ''")
+
+    def add(self, feed_name: str, entries) -> int:
+        """Archive EntryRecords for `feed_name`, returning how many were new (or gained an author/tags)."""
+        now = time.time()
+        rows = [
+            (feed_name, entry.key, entry.title, entry.description, entry.link, entry.published, now, entry.author, TAG_SEPARATOR.join(entry.tags))
+            for entry in entries
+            if entry.key
+        ]
+        inserted = 0
+        with self._lock, self._conn:
+            for start in range(0, len(rows), INSERT_BATCH_SIZE):
+                before = self._conn.total_changes
+                # Existing entries are only touched to fill in an author/tags archived before those existed.
+                self._conn.executemany(
+                    "INSERT INTO entries (feed, key, title, description, url, published, archived_at, author, tags) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (feed, key) DO UPDATE SET author = excluded.author, tags = excluded.tags "
+                    "WHERE entries.author = '' AND entries.tags = '' AND (excluded.author != '' OR excluded.tags != '')",
+                    rows[start:start + INSERT_BATCH_SIZE],
+                )
+                inserted += self._conn.total_changes - before
+        if inserted:
+            logger.debug("Archived %d new entries for %s", inserted, feed_name)
+        return inserted
+
+    def load(self, feed_name: str) -> list[tuple]:
+        """Return (title, description, url, published, author, tags) for every archived entry of `feed_name`, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT title, description, url, published, author, tags FROM entries WHERE feed = ? ORDER BY published DESC, rowid",
+                (feed_name,),
+            ).fetchall()
+        return [(*row[:5], tuple(row[5].split(TAG_SEPARATOR)) if row[5] else ()) for row in rows]
+
+    def count(self, feed_name: str) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries WHERE feed = ?", (feed_name,)).fetchone()[0]
+
+    def claim(self, feed_name: str, interval: float) -> bool:
+        """Take the poll for `feed_name` unless another worker took it less than `interval` seconds ago."""
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO polls (feed, polled_at) VALUES (?, ?) "
+                "ON CONFLICT (feed) DO UPDATE SET polled_at = excluded.polled_at WHERE polled_at <= ?",
+                (feed_name, now, now - interval),
+            )
+            return cursor.rowcount == 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
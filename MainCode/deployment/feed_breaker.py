@@ -0,0 +1,76 @@
+"""Circuit breaker for upstream feed fetches.
+
+Each feed URL gets its own breaker. It opens after `failures` consecutive
+failed or slow fetches, and while it is open FeedCache serves the last good
+feed without contacting the upstream. Once the jittered backoff has passed, a
+single probe is let through (half-open): success closes the breaker, failure
+opens it again with the backoff doubled, up to `max_reset` seconds.
+"""
+import os
+import random
+import time
+
+FEED_BREAKER_FAILURES = int(os.environ.get("FEED_BREAKER_FAILURES", "3"))
+FEED_BREAKER_SLOW = float(os.environ.get("FEED_BREAKER_SLOW", "5"))
+FEED_BREAKER_RESET = float(os.environ.get("FEED_BREAKER_RESET", "30"))
+FEED_BREAKER_MAX_RESET = float(os.environ.get("FEED_BREAKER_MAX_RESET", "600"))
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failures: int = FEED_BREAKER_FAILURES,
+        slow: float = FEED_BREAKER_SLOW,
+        reset: float = FEED_BREAKER_RESET,
+        max_reset: float = FEED_BREAKER_MAX_RESET,
+        clock=time.monotonic,
+        jitter=random.random,
+    ):
+        self.threshold = failures
+        self.slow = slow
+        self.reset = reset
+        self.max_reset = max_reset
+        self.clock = clock
+        self.jitter = jitter
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.retry_at = 0.0
+        self.last_error: str | None = None
+
+    def allow(self) -> bool:
+        """Whether a fetch may go upstream now; moves an open breaker whose backoff has passed to half-open."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and self.clock() >= self.retry_at:
+            self.state = HALF_OPEN
+            return True
+        return False  # open, or half-open with its probe still out
+
+    def retry_in(self) -> float:
+        return max(0.0, self.retry_at - self.clock())
+
+    def record_success(self, seconds: float) -> bool:
+        """Record a completed fetch; a slow one counts as a failure. Returns True if the breaker opened."""
+        if seconds > self.slow:
+            return self.record_failure(f"slow response ({seconds:.1f}s)")
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.last_error = None
+        return False
+
+    def record_failure(self, error: str) -> bool:
+        """Record a failed fetch. Returns True if the breaker opened."""
+        self.failures += 1
+        self.last_error = error
+        if self.state != HALF_OPEN and self.failures < self.threshold:
+            return False
+        # Jitter between half and one and a half times the backoff, so feeds and workers don't probe in lockstep.
+        backoff = min(self.max_reset, self.reset * 2 ** self.trips)
+        self.trips += 1
+        self.state = OPEN
+        self.retry_at = self.clock() + backoff * (0.5 + self.jitter())
+        return True
@@ -0,0 +1,271 @@
+"""Shared cache for parsed RSS feeds.
+
+Feeds are kept for `ttl` seconds, then served stale for up to `stale_ttl` more
+seconds while a background refresh revalidates them with ETag/Last-Modified.
+Concurrent misses for the same URL share a single upstream fetch.
+
+Feeds are downloaded with one pooled httpx.AsyncClient (keep-alive, HTTP/2,
+timeouts, bounded concurrency) and only the bytes are handed to the
+ParseExecutor, so fetching never blocks the event loop. Cached feeds are
+ParsedFeed records rather than full feedparser objects.
+
+Each download has a per-feed deadline, and each feed URL has a CircuitBreaker:
+after repeated failed or slow fetches the cache stops calling the upstream,
+keeps serving the last good feed (health() reports it as stale), and probes
+the upstream in the background on a jittered backoff until it recovers.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import NamedTuple
+
+import httpx
+
+from feed_breaker import CLOSED, OPEN, CircuitBreaker
+
+from feed_metrics import Metrics
+from feed_parse import ParseExecutor, ParsedFeed
+
+logger = logging.getLogger(__name__)
+
+FEED_CACHE_TTL = float(os.environ.get("FEED_CACHE_TTL", "300"))
+FEED_CACHE_STALE_TTL = float(os.environ.get("FEED_CACHE_STALE_TTL", "3600"))
+FEED_FETCH_TIMEOUT = float(os.environ.get("FEED_FETCH_TIMEOUT", "10"))
+FEED_FETCH_DEADLINE = float(os.environ.get("FEED_FETCH_DEADLINE", "10"))
+FEED_FETCH_CONCURRENCY = int(os.environ.get("FEED_FETCH_CONCURRENCY", "8"))
+
+USER_AGENT = "fcc-mcp-feed-searcher (+https://www.freecodecamp.org)"
+
+
+class CachedFeed:
+    __slots__ = ("feed", "etag", "modified", "fetched_at")
+
+    def __init__(self, feed, etag=None, modified=None, fetched_at=0.0):
+        self.feed = feed
+        self.etag = etag
+        self.modified = modified
+        self.fetched_at = fetched_at
+
+
+class FeedHealth(NamedTuple):
+    state: str
+    stale: bool
+    updated_at: float | None
+    error: str | None
+    retry_in: float
+
+
+def create_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=True,
+        follow_redirects=True,
+        timeout=httpx.Timeout(FEED_FETCH_TIMEOUT),
+        limits=httpx.Limits(max_connections=FEED_FETCH_CONCURRENCY, max_keepalive_connections=FEED_FETCH_CONCURRENCY, keepalive_expiry=60),
+        headers={"User-Agent": USER_AGENT},
+    )
+
+
+class FeedCache:
+    def __init__(
+        self,
+        ttl: float = FEED_CACHE_TTL,
+        stale_ttl: float = FEED_CACHE_STALE_TTL,
+        client: httpx.AsyncClient | None = None,
+        parser: ParseExecutor | None = None,
+        metrics: Metrics | None = None,
+        deadline: float = FEED_FETCH_DEADLINE,
+        deadlines: dict[str, float] | None = None,
+        names: dict[str, str] | None = None,
+        breaker_factory=CircuitBreaker,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._client = client
+        self.parser = parser or ParseExecutor()
+        self.metrics = metrics or Metrics()
+        self.metrics.describe("feed_fetches_total", "Upstream feed requests, by feed and result.")
+        self.metrics.describe("feed_fetch_seconds", "Time spent downloading a feed, by feed.")
+        self.metrics.describe("feed_parse_seconds", "Time spent parsing a downloaded feed, by feed.")
+        self.metrics.describe("feed_breaker_open", "1 while the feed's circuit breaker is open or half-open, by feed.")
+        self.deadline = deadline
+        self.deadlines = deadlines or {}
+        # Registry names by URL, so these metrics share the feed label with the search metrics.
+        self.names = names or {}
+        self._feeds: dict[str, CachedFeed] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.breaker_factory = breaker_factory
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._probes: dict[str, asyncio.TimerHandle] = {}
+        # URLs whose last refresh failed or was short-circuited, so what is cached is out of date.
+        self._stale: set[str] = set()
+        self._semaphore = asyncio.Semaphore(FEED_FETCH_CONCURRENCY)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created on first use so it binds to the server's running event loop.
+        if self._client is None:
+            self._client = create_client()
+        return self._client
+
+    async def get(self, url: str) -> ParsedFeed:
+        """Return the parsed feed for `url`, fetching it only when needed."""
+        cached = self._feeds.get(url)
+        if cached is not None:
+            age = time.monotonic() - cached.fetched_at
+            if age < self.ttl:
+                return cached.feed
+            if age < self.ttl + self.stale_ttl:
+                self.refresh_in_background(url)
+                return cached.feed
+        return (await self.refresh(url)).feed
+
+    async def refresh(self, url: str) -> CachedFeed:
+        """Revalidate `url` upstream; callers arriving mid-fetch wait on the same result."""
+        task = self._inflight.get(url)
+        if task is None:
+            task = self._start_refresh(url)
+        # Shielded so one cancelled caller doesn't abort the fetch for everyone else.
+        return await asyncio.shield(task)
+
+    def refresh_in_background(self, url: str) -> None:
+        if url not in self._inflight:
+            self._start_refresh(url)
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        breaker = self._breakers.get(url)
+        if breaker is None:
+            breaker = self._breakers[url] = self.breaker_factory()
+        return breaker
+
+    def health(self, url: str) -> FeedHealth:
+        """How fresh the feed served for `url` is; `stale` when the last refresh didn't update it."""
+        cached = self._feeds.get(url)
+        updated_at = None if cached is None else time.time() - (time.monotonic() - cached.fetched_at)
+        breaker = self._breakers.get(url)
+        if breaker is None:
+            return FeedHealth(CLOSED, False, updated_at, None, 0.0)
+        return FeedHealth(breaker.state, url in self._stale, updated_at, breaker.last_error, breaker.retry_in())
+
+    def invalidate(self, url: str | None = None) -> None:
+        if url is None:
+            self._feeds.clear()
+        else:
+            self._feeds.pop(url, None)
+
+    async def aclose(self) -> None:
+        for probe in self._probes.values():
+            probe.cancel()
+        self._probes.clear()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self.parser.shutdown()
+
+    def _label(self, url: str) -> str:
+        return self.names.get(url, url)
+
+    def _start_refresh(self, url: str) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(self._revalidate(url))
+        self._inflight[url] = task
+        task.add_done_callback(lambda done: self._refresh_done(url, done))
+        return task
+
+    def _refresh_done(self, url: str, task: asyncio.Task) -> None:
+        if self._inflight.get(url) is task:
+            del self._inflight[url]
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Refreshing %s failed", url, exc_info=task.exception())
+
+    def _schedule_probe(self, url: str) -> None:
+        if url not in self._probes:
+            delay = self.breaker(url).retry_in()
+            self._probes[url] = asyncio.get_running_loop().call_later(delay, self._probe, url)
+
+    def _probe(self, url: str) -> None:
+        del self._probes[url]
+        self.refresh_in_background(url)
+
+    def _opened(self, url: str) -> None:
+        breaker = self.breaker(url)
+        logger.warning("Circuit for %s opened (%s); probing again in %.0fs", url, breaker.last_error, breaker.retry_in())
+        self.metrics.set("feed_breaker_open", 1, feed=self._label(url))
+        self._schedule_probe(url)
+
+    def _failed(self, url: str, error: str) -> None:
+        self._stale.add(url)
+        if self.breaker(url).record_failure(error):
+            self._opened(url)
+
+    def _succeeded(self, url: str, seconds: float) -> None:
+        # Even a slow fetch that trips the breaker brought a current copy.
+        self._stale.discard(url)
+        breaker = self.breaker(url)
+        was_closed = breaker.state == CLOSED
+        if breaker.record_success(seconds):
+            self._opened(url)
+        elif not was_closed:
+            logger.info("Circuit for %s closed", url)
+            self.metrics.set("feed_breaker_open", 0, feed=self._label(url))
+
+    async def _revalidate(self, url: str) -> CachedFeed:
+        cached = self._feeds.get(url)
+        label = self._label(url)
+        breaker = self.breaker(url)
+        if not breaker.allow():
+            # Open: answer from what we have and leave the upstream to the background probe.
+            self.metrics.inc("feed_fetches_total", feed=label, result="short_circuit")
+            self._stale.add(url)
+            if breaker.state == OPEN:
+                self._schedule_probe(url)
+            return cached or CachedFeed(ParsedFeed((), f"circuit open: {breaker.last_error}"))
+
+        headers = {}
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached is not None and cached.modified:
+            headers["If-Modified-Since"] = cached.modified
+
+        deadline = self.deadlines.get(url, self.deadline)
+        try:
+            async with self._semaphore:
+                started = time.perf_counter()
+                response = await asyncio.wait_for(self.client.get(url, headers=headers), deadline)
+                elapsed = time.perf_counter() - started
+                self.metrics.observe("feed_fetch_seconds", elapsed, feed=label)
+            if cached is not None and response.status_code == 304:
+                logger.debug("Feed %s not modified", url)
+                self.metrics.inc("feed_fetches_total", feed=label, result="not_modified")
+                self._succeeded(url, elapsed)
+                cached.fetched_at = time.monotonic()
+                return cached
+            response.raise_for_status()
+        except (httpx.HTTPError, asyncio.TimeoutError) as exc:
+            # Upstream failed; keep serving what we have and let the stale window and breaker decide.
+            if isinstance(exc, httpx.HTTPStatusError):
+                error = f"HTTP {exc.response.status_code}"
+            elif isinstance(exc, httpx.HTTPError):
+                error = str(exc) or type(exc).__name__
+            else:
+                error = f"no response within {deadline:g}s"
+            logger.warning("Fetching %s failed: %s", url, error)
+            self.metrics.inc("feed_fetches_total", feed=label, result="error")
+            self._failed(url, error)
+            return cached or CachedFeed(ParsedFeed((), error))
+        except asyncio.CancelledError:
+            self._failed(url, "cancelled")  # never leave a half-open breaker waiting on a probe that's gone
+            raise
+
+        self.metrics.inc("feed_fetches_total", feed=label, result="ok")
+        started = time.perf_counter()
+        feed = await self.parser.parse(response.content, dict(response.headers))
+        self.metrics.observe("feed_parse_seconds", time.perf_counter() - started, feed=label)
+        if feed.error and not feed.entries:
+            logger.warning("Parsing %s failed: %s", url, feed.error)
+            self._failed(url, feed.error)
+            return cached or CachedFeed(feed)
+
+        self._succeeded(url, elapsed)
+        cached = CachedFeed(feed, response.headers.get("ETag"), response.headers.get("Last-Modified"), time.monotonic())
+        self._feeds[url] = cached
+        return cached
@@ -0,0 +1,79 @@
+"""Secondary indexes for filtering a snapshot by publication time, author and tag.
+
+RecordFilters is built once per FeedSnapshot. Entries with a publication time
+are kept sorted by it, so a since/until window is two bisections plus a slice
+(O(log n + k)) and "most recent first" is just reading that order backwards.
+Authors and tags map, case-insensitively, to the positions of their entries.
+"""
+import re
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+
+RELATIVE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([mhdw])\s*$")
+UNIT_SECONDS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_time(value: str, now: float | None = None) -> float:
+    """Parse an ISO-8601 date/time (UTC unless it has an offset) or a relative age like "7d" or "12h"."""
+    match = RELATIVE_RE.match(value)
+    if match:
+        return (time.time() if now is None else now) - float(match[1]) * UNIT_SECONDS[match[2]]
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid time {value!r}; use an ISO date like 2025-01-31 or an age like 7d, 12h, 2w.") from None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class RecordFilters:
+    def __init__(self, records):
+        dated = sorted((record.published, doc) for doc, record in enumerate(records) if record.published is not None)
+        self.times = [published for published, _ in dated]
+        self.by_time = [doc for _, doc in dated]
+        dated_docs = set(self.by_time)
+        # Every position newest first, entries without a date last in feed order; built once for recent().
+        self.newest_first = tuple(self.by_time[::-1] + [doc for doc in range(len(records)) if doc not in dated_docs])
+        self.authors: dict[str, list[int]] = {}
+        self.tags: dict[str, list[int]] = {}
+        for doc, record in enumerate(records):
+            if record.author:
+                self.authors.setdefault(record.author.lower(), []).append(doc)
+            for tag in record.tags:
+                self.tags.setdefault(tag.lower(), []).append(doc)
+
+    def window(self, since: float | None = None, until: float | None = None) -> list[int]:
+        """Positions of entries published within [since, until], newest first."""
+        start = 0 if since is None else bisect_left(self.times, since)
+        end = len(self.times) if until is None else bisect_right(self.times, until)
+        return self.by_time[start:end][::-1]
+
+    def recent(self) -> tuple[int, ...]:
+        """Every position, newest first; entries without a date come last, in feed order."""
+        return self.newest_first
+
+    def select(
+        self,
+        since: float | None = None,
+        until: float | None = None,
+        author: str | None = None,
+        tag: str | None = None,
+    ) -> list[int] | None:
+        """Positions passing every given filter, or None when no filter is given.
+
+        The result is newest first when a time filter is given, else in feed order.
+        """
+        candidates = []
+        if since is not None or until is not None:
+            candidates.append(self.window(since, until))
+        if author:
+            candidates.append(self.authors.get(author.strip().lower(), []))
+        if tag:
+            candidates.append(self.tags.get(tag.strip().lower(), []))
+        if not candidates:
+            return None
+        # Walk the first list (it carries the ordering) and probe the others as sets.
+        others = [set(docs) for docs in candidates[1:]]
+        return [doc for doc in candidates[0] if all(doc in docs for docs in others)]
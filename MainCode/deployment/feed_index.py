@@ -0,0 +1,133 @@
+"""Inverted token index with BM25 ranking over feed records.
+
+An index is built once per FeedSnapshot. Searching only touches the posting
+lists of the query terms (and of the vocabulary terms they prefix), so cost
+grows with the number of matches rather than with the size of the feed.
+Vocabulary terms are interned so the per-field indexes share one copy.
+"""
+import heapq
+import math
+import re
+import sys
+from bisect import bisect_left
+from collections import Counter
+
+from feed_records import search_text
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:\+\+|#)?")
+
+FIELDS = ("title", "description")
+FIELD_WEIGHTS = {"title": 2.0, "description": 1.0}
+
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase `text`, drop any HTML tags and split it into search tokens."""
+    return TOKEN_RE.findall(search_text(text))
+
+
+class _FieldIndex:
+    __slots__ = ("postings", "vocabulary", "lengths", "avg_length")
+
+    def __init__(self, documents: list[str]):
+        """Index `documents`, which must already be normalised with search_text()."""
+        self.postings: dict[str, list[tuple[int, int]]] = {}
+        self.lengths = []
+        for doc_id, text in enumerate(documents):
+            tokens = TOKEN_RE.findall(text)
+            self.lengths.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                postings = self.postings.get(term)
+                if postings is None:
+                    postings = self.postings[sys.intern(term)] = []
+                postings.append((doc_id, tf))
+        self.vocabulary = sorted(self.postings)
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+
+    def expand(self, term: str, prefix: bool) -> list[str]:
+        if not prefix:
+            return [term] if term in self.postings else []
+        start = bisect_left(self.vocabulary, term)
+        end = bisect_left(self.vocabulary, term + "\uffff", start)
+        return self.vocabulary[start:end]
+
+
+class FeedIndex:
+    def __init__(self, records):
+        self.size = len(records)
+        self._fields = {
+            "title": _FieldIndex([record.search_title for record in records]),
+            "description": _FieldIndex([record.search_description for record in records]),
+        }
+
+    def search(
+        self,
+        query: str,
+        fields: tuple[str, ...] = FIELDS,
+        mode: str = "and",
+        prefix: bool = True,
+        limit: int | None = None,
+    ) -> list[int]:
+        """Return record positions matching `query`, best BM25 score first.
+
+        With mode="and" every query term must match; with mode="or" any term may.
+        When `prefix` is set, a query term also matches vocabulary terms it starts.
+        """
+        return [doc for _, doc in self.search_scored(query, fields, mode, prefix, limit)]
+
+    def search_scored(
+        self,
+        query: str,
+        fields: tuple[str, ...] = FIELDS,
+        mode: str = "and",
+        prefix: bool = True,
+        limit: int | None = None,
+        docs: set[int] | None = None,
+    ) -> list[tuple[float, int]]:
+        """Like search(), but return (score, position) pairs, optionally only among positions in `docs`."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.size:
+            return []
+
+        scores: dict[int, float] | None = None
+        for term in terms:
+            term_scores = self._score_term(term, fields, prefix)
+            if scores is None:
+                scores = term_scores
+            elif mode == "and":
+                scores = {doc: score + term_scores[doc] for doc, score in scores.items() if doc in term_scores}
+            else:
+                for doc, score in term_scores.items():
+                    scores[doc] = scores.get(doc, 0.0) + score
+            if mode == "and" and not scores:
+                return []
+        if docs is not None:
+            scores = {doc: score for doc, score in scores.items() if doc in docs}
+
+        # Ties keep feed order, which is newest first for RSS.
+        ranked = ((-score, doc) for doc, score in scores.items())
+        top = sorted(ranked) if limit is None else heapq.nsmallest(limit, ranked)
+        return [(-score, doc) for score, doc in top]
+
+    def _score_term(self, term: str, fields: tuple[str, ...], prefix: bool) -> dict[int, float]:
+        scores: dict[int, float] = {}
+        for field in fields:
+            index = self._fields[field]
+            weight = FIELD_WEIGHTS[field]
+            field_scores: dict[int, float] = {}
+            for expanded in index.expand(term, prefix):
+                postings = index.postings[expanded]
+                idf = math.log(1 + (self.size - len(postings) + 0.5) / (len(postings) + 0.5))
+                if expanded != term:
+                    idf *= 0.5  # prefix hits rank below exact ones
+                for doc, tf in postings:
+                    norm = K1 * (1 - B + B * index.lengths[doc] / index.avg_length)
+                    score = weight * idf * tf * (K1 + 1) / (tf + norm)
+                    # Several expansions of one query term count once, at their best.
+                    if score > field_scores.get(doc, 0.0):
+                        field_scores[doc] = score
+            for doc, score in field_scores.items():
+                scores[doc] = scores.get(doc, 0.0) + score
+        return scores
@@ -0,0 +1,131 @@
+"""Per-tool and per-feed metrics for the deployed server, in Prometheus text format.
+
+MetricsMiddleware counts every tool call, its errors and its latency, and
+tracks how many calls are in flight. FeedCache and the search tools record
+feed fetch, parse and search timings into the same Metrics, which the server
+exposes on /metrics.
+"""
+import threading
+import time
+from collections import defaultdict
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_key(labels: dict[str, str]) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key: tuple[tuple[str, str], ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    def __init__(self, namespace: str = "fcc_mcp"):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._help: dict[str, str] = {}
+        self._counters: dict[str, dict] = defaultdict(lambda: defaultdict(float))
+        self._gauges: dict[str, dict] = defaultdict(lambda: defaultdict(float))
+        self._histograms: dict[str, dict] = defaultdict(lambda: defaultdict(Histogram))
+
+    def describe(self, name: str, help_text: str) -> None:
+        self._help[name] = help_text
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        with self._lock:
+            self._counters[name][_label_key(labels)] += value
+
+    def add(self, name: str, value: float, **labels: str) -> None:
+        with self._lock:
+            self._gauges[name][_label_key(labels)] += value
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        with self._lock:
+            self._gauges[name][_label_key(labels)] = value
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        with self._lock:
+            self._histograms[name][_label_key(labels)].observe(seconds)
+
+    def render(self, **labels: str) -> str:
+        """Return every metric in the Prometheus text exposition format, adding `labels` to every series."""
+        extra = _label_key(labels)
+        lines = []
+        with self._lock:
+            for kind, series in (("counter", self._counters), ("gauge", self._gauges)):
+                for name, values in sorted(series.items()):
+                    full_name = self._header(lines, name, kind)
+                    for key, value in sorted(values.items()):
+                        key += extra
+                        lines.append(f"{full_name}{_format_labels(key)} {value:g}")
+            for name, values in sorted(self._histograms.items()):
+                full_name = self._header(lines, name, "histogram")
+                for key, histogram in sorted(values.items()):
+                    key += extra
+                    cumulative = 0
+                    for bound, count in zip(LATENCY_BUCKETS, histogram.counts):
+                        cumulative += count
+                        bucket_labels = _format_labels(key, 'le="%g"' % bound)
+                        lines.append(f"{full_name}_bucket{bucket_labels} {cumulative}")
+                    bucket_labels = _format_labels(key, 'le="+Inf"')
+                    lines.append(f"{full_name}_bucket{bucket_labels} {histogram.count}")
+                    lines.append(f"{full_name}_sum{_format_labels(key)} {histogram.sum:g}")
+                    lines.append(f"{full_name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines: list[str], name: str, kind: str) -> str:
+        full_name = f"{self.namespace}_{name}"
+        help_text = self._help.get(name, name.replace("_", " "))
+        lines.append(f"# HELP {full_name} {help_text}")
+        lines.append(f"# TYPE {full_name} {kind}")
+        return full_name
+
+
+class MetricsMiddleware(Middleware):
+    def __init__(self, metrics: Metrics):
+        self.metrics = metrics
+        metrics.describe("tool_calls_total", "Tool calls received, by tool.")
+        metrics.describe("tool_errors_total", "Tool calls that raised an error, by tool.")
+        metrics.describe("tool_duration_seconds", "Tool call latency, by tool.")
+        metrics.describe("tool_in_flight", "Tool calls currently executing, by tool.")
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext):
+        tool = context.message.name
+        self.metrics.inc("tool_calls_total", tool=tool)
+        self.metrics.add("tool_in_flight", 1, tool=tool)
+        started = time.perf_counter()
+        try:
+            return await call_next(context)
+        except Exception:
+            self.metrics.inc("tool_errors_total", tool=tool)
+            raise
+        finally:
+            self.metrics.observe("tool_duration_seconds", time.perf_counter() - started, tool=tool)
+            self.metrics.add("tool_in_flight", -1, tool=tool)
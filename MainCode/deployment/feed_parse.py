@@ -0,0 +1,100 @@
+"""Feed parsing, optionally spread over a process pool.
+
+feedparser is pure Python and CPU-bound, so large feeds can stall the event
+loop. parse_feed() reduces a feed to compact EntryRecord tuples, which keeps the
+result cheap to pickle back from a worker process. Set FEED_PARSE_WORKERS to a
+positive number to parse in a ProcessPoolExecutor; by default feeds are parsed
+in-process. feedparser itself is only imported on the first parse, so stdio
+servers don't pay for it at startup.
+"""
+import asyncio
+import calendar
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+
+logger = logging.getLogger(__name__)
+
+FEED_PARSE_WORKERS = int(os.environ.get("FEED_PARSE_WORKERS", "0"))
+
+
+class EntryRecord(NamedTuple):
+    key: str
+    title: str
+    description: str
+    link: str
+    published: float | None
+    author: str = ""
+    tags: tuple[str, ...] = ()
+
+
+class ParsedFeed(NamedTuple):
+    entries: tuple[EntryRecord, ...]
+    error: str | None = None
+
+
+def entry_published(entry) -> float | None:
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    return float(calendar.timegm(parsed)) if parsed else None
+
+
+def parse_feed(content: bytes, headers: dict[str, str] | None = None) -> ParsedFeed:
+    import feedparser
+
+    feed = feedparser.parse(content, response_headers=headers)
+    entries = tuple(
+        EntryRecord(
+            entry.get("id") or entry.get("link", ""),
+            entry.get("title", ""),
+            entry.get("description", ""),
+            entry.get("link", ""),
+            entry_published(entry),
+            entry.get("author", ""),
+            tuple(tag["term"] for tag in entry.get("tags", ()) if tag.get("term")),
+        )
+        for entry in feed.entries
+    )
+    error = str(feed.get("bozo_exception")) if feed.get("bozo") else None
+    return ParsedFeed(entries, error)
+
+
+def _warm_up(_) -> int:
+    import feedparser  # noqa: F401  load it before the first real parse
+
+    return os.getpid()
+
+
+class ParseExecutor:
+    def __init__(self, workers: int = FEED_PARSE_WORKERS):
+        self.workers = workers
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Spawn the worker processes and wait until every one of them is ready."""
+        with self._lock:
+            if self.workers <= 0 or self._pool is not None:
+                return
+            # Not fork: the pool starts from a worker thread of a multi-threaded server, and a forked
+            # child could inherit a lock (SQLite, logging, the thread pool) held by another thread.
+            pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("forkserver"))
+            # The pool spawns lazily; run one task per worker so the first real parse doesn't pay for it.
+            pids = set(pool.map(_warm_up, range(self.workers)))
+            logger.debug("Feed parse pool ready with %d workers", len(pids))
+            self._pool = pool
+
+    async def parse(self, content: bytes, headers: dict[str, str] | None = None) -> ParsedFeed:
+        if self.workers <= 0:
+            return parse_feed(content, headers)
+        if self._pool is None:
+            await asyncio.to_thread(self.start)
+        return await asyncio.get_running_loop().run_in_executor(self._pool, parse_feed, content, headers)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,124 @@
+"""Background poller that keeps pre-parsed feed snapshots ready for searching.
+
+The poller refreshes every feed through the shared FeedCache on an interval,
+appends new entries to the FeedArchive and publishes an immutable FeedSnapshot
+of the archived entries, with its search and filter indexes built once, so
+the search tools never fetch or parse on the request path.
+
+When several workers share the archive, one of them polls each feed per
+interval and the others reload their snapshots from the archive.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import NamedTuple
+
+from feed_archive import FeedArchive
+from feed_cache import FeedCache
+from feed_filters import RecordFilters
+from feed_index import FeedIndex
+from feed_records import FeedRecord
+
+logger = logging.getLogger(__name__)
+
+FEED_POLL_INTERVAL = float(os.environ.get("FEED_POLL_INTERVAL", "300"))
+
+
+class FeedSnapshot(NamedTuple):
+    records: tuple[FeedRecord, ...]
+    index: FeedIndex
+    filters: RecordFilters
+    updated_at: float
+
+
+EMPTY_SNAPSHOT = FeedSnapshot((), FeedIndex(()), RecordFilters(()), 0.0)
+
+
+def build_snapshot(rows) -> FeedSnapshot:
+    records = tuple(FeedRecord(*row) for row in rows)
+    return FeedSnapshot(records, FeedIndex(records), RecordFilters(records), time.time())
+
+
+class FeedPoller:
+    def __init__(self, cache: FeedCache, archive: FeedArchive, feeds: dict[str, str], interval: float = FEED_POLL_INTERVAL):
+        self.cache = cache
+        self.archive = archive
+        self.feeds = feeds
+        self.interval = interval
+        self._snapshots: dict[str, FeedSnapshot] = {}
+        self._parsed: dict[str, object] = {}
+        self._task: asyncio.Task | None = None
+
+    def published(self, name: str) -> FeedSnapshot:
+        """Return the snapshot currently published for `name` without loading anything."""
+        return self._snapshots.get(name, EMPTY_SNAPSHOT)
+
+    async def snapshot(self, name: str) -> FeedSnapshot:
+        """Return the latest snapshot for `name`, loading or polling it if none was published yet."""
+        snapshot = self._snapshots.get(name)
+        if snapshot is None:
+            snapshot = await self.load(name)
+        if not snapshot.records and name not in self._parsed:
+            snapshot = await self.poll(name)
+        return snapshot
+
+    async def load(self, name: str) -> FeedSnapshot:
+        """Publish the archived entries of `name` without touching the network."""
+        snapshot = await asyncio.to_thread(self._build, name)
+        self._snapshots[name] = snapshot
+        logger.debug("Published %d records for %s", len(snapshot.records), name)
+        return snapshot
+
+    async def poll(self, name: str) -> FeedSnapshot:
+        feed = (await self.cache.refresh(self.feeds[name])).feed
+        snapshot = self._snapshots.get(name)
+        if snapshot is not None and feed is self._parsed.get(name):
+            return snapshot  # not modified upstream
+
+        added = await asyncio.to_thread(self.archive.add, name, feed.entries)
+        if added or snapshot is None or not snapshot.records:
+            snapshot = await self.load(name)
+        self._parsed[name] = feed
+        return snapshot
+
+    async def sync(self, name: str) -> FeedSnapshot:
+        """Reload `name` if another worker archived new entries since the snapshot was built."""
+        snapshot = self._snapshots.get(name)
+        count = await asyncio.to_thread(self.archive.count, name)
+        if snapshot is None or count != len(snapshot.records):
+            snapshot = await self.load(name)
+        return snapshot
+
+    async def _refresh(self, name: str) -> FeedSnapshot:
+        # Half an interval of slack so a single worker always wins its own next claim.
+        if await asyncio.to_thread(self.archive.claim, name, self.interval / 2):
+            return await self.poll(name)
+        return await self.sync(name)
+
+    def _build(self, name: str) -> FeedSnapshot:
+        return build_snapshot(self.archive.load(name))
+
+    def start(self) -> None:
+        """Start polling on the running event loop; safe to call more than once."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        # Warm start: serve whatever the archive already holds before the first fetch.
+        await asyncio.gather(*(self.load(name) for name in self.feeds if name not in self._snapshots))
+        while True:
+            results = await asyncio.gather(*(self._refresh(name) for name in self.feeds), return_exceptions=True)
+            for name, result in zip(self.feeds, results):
+                if isinstance(result, Exception):
+                    logger.error("Polling %s failed", name, exc_info=result)
+            await asyncio.sleep(self.interval)
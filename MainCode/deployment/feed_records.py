@@ -0,0 +1,42 @@
+"""Compact in-memory representation of feed entries.
+
+Snapshots can hold the whole archive, so each entry keeps only what the tools
+use: the title and URL they return, the lowercased, tag-free text the index
+searches, and the publication time, author and tags the filters use. Authors
+and tags repeat across entries, so they are interned. The raw description
+stays in the archive.
+"""
+import re
+import sys
+
+TAG_RE = re.compile(r"<[^>]+>")
+SPACE_RE = re.compile(r"\s+")
+
+
+def search_text(text: str) -> str:
+    """Lowercase `text` and strip HTML tags and redundant whitespace."""
+    return SPACE_RE.sub(" ", TAG_RE.sub(" ", text)).strip().lower()
+
+
+class FeedRecord:
+    __slots__ = ("title", "url", "search_title", "search_description", "published", "author", "tags")
+
+    def __init__(
+        self,
+        title: str,
+        description: str,
+        url: str,
+        published: float | None = None,
+        author: str = "",
+        tags: tuple[str, ...] = (),
+    ):
+        self.title = title
+        self.url = url
+        self.search_title = search_text(title)
+        self.search_description = search_text(description)
+        self.published = published
+        self.author = sys.intern(author)
+        self.tags = tuple(sys.intern(tag) for tag in tags)
+
+    def __repr__(self) -> str:
+        return f"FeedRecord(title={self.title!r}, url={self.url!r})"
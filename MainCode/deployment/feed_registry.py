@@ -0,0 +1,37 @@
+"""Registry of the feeds the deployed server polls and searches.
+
+The registry is a JSON file mapping a feed name to its URL, the fields that
+are searchable for it and, optionally, its own fetch deadline in seconds:
+
+    {"news": {"url": "https://www.freecodecamp.org/news/rss/", "fields": ["title", "description"], "deadline": 5}}
+"""
+import json
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+from feed_index import FIELDS
+
+FEED_REGISTRY_PATH = os.environ.get("FEED_REGISTRY_PATH", str(Path(__file__).resolve().parent / "feeds.json"))
+
+
+class FeedSource(NamedTuple):
+    name: str
+    url: str
+    fields: tuple[str, ...] = FIELDS
+    deadline: float | None = None
+
+
+def load_registry(path: str = FEED_REGISTRY_PATH) -> dict[str, FeedSource]:
+    with open(path, encoding="utf-8") as file:
+        raw = json.load(file)
+
+    registry = {}
+    for name, config in raw.items():
+        fields = tuple(config.get("fields", FIELDS))
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Feed {name!r} has unknown searchable fields: {sorted(unknown)}")
+        deadline = config.get("deadline")
+        registry[name] = FeedSource(name, config["url"], fields, None if deadline is None else float(deadline))
+    return registry
@@ -0,0 +1,109 @@
+"""TF-IDF similarity index for finding related feed entries.
+
+Documents are kept as raw term counts in a SciPy CSR matrix together with
+per-term document frequencies. New entries append rows (and vocabulary
+columns) instead of rebuilding the matrix; the IDF weights and document norms
+are recomputed from the counts with a few vectorized operations when the
+index changes. A query is weighted the same way and scored against every
+document with one sparse matrix-vector product, then the top k are picked with
+argpartition.
+"""
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+from feed_index import TOKEN_RE
+from feed_records import search_text
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by can do for from how i in into is it its of on or that the this to "
+    "what when why with you your".split()
+)
+
+
+def terms(text: str) -> Counter:
+    """Count the tokens of `text`, which must already be normalised with search_text()."""
+    return Counter(token for token in TOKEN_RE.findall(text) if token not in STOP_WORDS)
+
+
+class RelatedIndex:
+    def __init__(self):
+        self.vocabulary: dict[str, int] = {}
+        self.documents: list[object] = []
+        self._keys: dict[str, int] = {}
+        self._doc_freq = np.zeros(0, dtype=np.float64)
+        # (counts, idf, norms) swapped in as one tuple so searches never see a half-updated index.
+        self._weights = (sparse.csr_matrix((0, 0), dtype=np.float64), np.zeros(0), np.zeros(0))
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def add(self, items) -> int:
+        """Index (key, text, document) items whose key is new; returns how many were added.
+
+        Not safe to call concurrently with itself; searches may run at the same time.
+        """
+        rows, cols, counts = [], [], []
+        keys, documents = {}, []
+        for key, text, document in items:
+            if key in self._keys or key in keys:
+                continue
+            for term, count in terms(text).items():
+                rows.append(len(documents))
+                cols.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+                counts.append(count)
+            keys[key] = len(self.documents) + len(documents)
+            documents.append(document)
+        if not documents:
+            return 0
+
+        matrix = self._weights[0]
+        width = len(self.vocabulary)
+        new_rows = sparse.csr_matrix((counts, (rows, cols)), shape=(len(documents), width), dtype=np.float64)
+        matrix = sparse.vstack([sparse.csr_matrix(matrix, shape=(matrix.shape[0], width)), new_rows], format="csr")
+        doc_freq = np.concatenate([self._doc_freq, np.zeros(width - len(self._doc_freq))])
+        doc_freq += np.bincount(new_rows.indices, minlength=width)
+
+        # Smoothed IDF, as in scikit-learn; it shifts for every term whenever documents are added.
+        idf = np.log((1 + matrix.shape[0]) / (1 + doc_freq)) + 1
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix) @ (idf ** 2)).ravel())
+
+        self.documents.extend(documents)
+        self._keys.update(keys)
+        self._doc_freq = doc_freq
+        self._weights = (matrix, idf, norms)
+        return len(documents)
+
+    def similar(self, text: str | None = None, key: str | None = None, limit: int = 5) -> list[tuple[float, object]]:
+        """Return the `limit` documents most similar to `text`, or to the indexed document `key`, best first."""
+        matrix, idf, norms = self._weights
+        row = self._keys.get(key) if key is not None else None
+        if row is not None and row < matrix.shape[0]:
+            query = matrix.getrow(row).toarray().ravel()
+        else:
+            row = None
+            query = np.zeros(len(idf))
+            for term, count in terms(search_text(text or "")).items():
+                col = self.vocabulary.get(term)
+                if col is not None and col < len(idf):
+                    query[col] = count
+        weights = query * idf
+        query_norm = np.linalg.norm(weights)
+        if not query_norm:
+            return []
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = (matrix @ (weights * idf)) / (norms * query_norm)
+        scores = np.nan_to_num(scores, nan=0.0)
+        if row is not None:
+            scores[row] = 0.0  # never suggest the document itself
+        limit = max(0, min(limit, len(scores)))
+        if not limit:
+            return []
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(float(scores[i]), self.documents[i]) for i in top if scores[i] > 0]
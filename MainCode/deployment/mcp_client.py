@@ -0,0 +1,177 @@
+"""Small synchronous MCP client for the Streamlit chatbot.
+
+One MCPClient keeps a pooled keep-alive httpx.Client, does the initialize
+handshake once, caches tools/list and sends proper JSON-RPC tools/call
+requests over streamable HTTP. Responses may come back as JSON or as an SSE
+stream; progress notifications in the stream are passed to `on_progress`.
+
+ResultCache is a small TTL + LRU cache for tool results, keyed on the tool name
+and its normalized arguments, so repeated searches skip the round-trip.
+"""
+import itertools
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import httpx
+
+PROTOCOL_VERSION = "2025-06-18"
+CLIENT_INFO = {"name": "fcc-chatbot", "version": "1.0"}
+
+
+class MCPError(Exception):
+    pass
+
+
+class MCPClient:
+    def __init__(self, url: str, timeout: float = 30):
+        self.url = url
+        self.session_id: str | None = None
+        self._client = httpx.Client(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=4, keepalive_expiry=120),
+        )
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._initialized = False
+        self._tools: list[dict] | None = None
+
+    def initialize(self) -> None:
+        """Run the MCP handshake; later calls are no-ops."""
+        with self._lock:
+            if self._initialized:
+                return
+            self._request("initialize", {"protocolVersion": PROTOCOL_VERSION, "capabilities": {}, "clientInfo": CLIENT_INFO})
+            self._notify("notifications/initialized")
+            self._initialized = True
+
+    def list_tools(self, refresh: bool = False) -> list[dict]:
+        if self._tools is None or refresh:
+            self.initialize()
+            self._tools = self._request("tools/list")["tools"]
+        return self._tools
+
+    def call_tool(self, name: str, arguments: dict | None = None, on_progress=None):
+        """Call tool `name` and return its result, decoded from JSON when possible.
+
+        `on_progress(progress, total, message)` is called for every progress
+        notification the server sends while the tool runs.
+        """
+        self.initialize()
+        params = {"name": name, "arguments": arguments or {}}
+        if on_progress:
+            params["_meta"] = {"progressToken": f"{name}-{next(self._ids)}"}
+        result = self._request("tools/call", params, on_progress)
+        if result.get("isError"):
+            raise MCPError(" ".join(item.get("text", "") for item in result.get("content", [])) or "tool call failed")
+        structured = result.get("structuredContent")
+        if structured is not None:
+            # FastMCP wraps non-object return values as {"result": value} and flags that in the output schema.
+            if self._output_schema(name).get("x-fastmcp-wrap-result"):
+                return structured["result"]
+            return structured
+        texts = [item["text"] for item in result.get("content", []) if item.get("type") == "text"]
+        text = "\n".join(texts)
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text
+
+    def _output_schema(self, name: str) -> dict:
+        for tool in self.list_tools():
+            if tool["name"] == name:
+                return tool.get("outputSchema") or {}
+        return {}
+
+    def close(self) -> None:
+        self._client.close()
+
+    def _headers(self) -> dict[str, str]:
+        headers = {"Accept": "application/json, text/event-stream", "MCP-Protocol-Version": PROTOCOL_VERSION}
+        if self.session_id:
+            headers["mcp-session-id"] = self.session_id
+        return headers
+
+    def _notify(self, method: str, params: dict | None = None) -> None:
+        message = {"jsonrpc": "2.0", "method": method, "params": params or {}}
+        self._client.post(self.url, json=message, headers=self._headers()).raise_for_status()
+
+    def _request(self, method: str, params: dict | None = None, on_progress=None) -> dict:
+        request_id = next(self._ids)
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}}
+        with self._client.stream("POST", self.url, json=message, headers=self._headers()) as response:
+            response.raise_for_status()
+            self.session_id = response.headers.get("mcp-session-id", self.session_id)
+            if response.headers.get("content-type", "").startswith("text/event-stream"):
+                reply = self._read_events(response, request_id, on_progress)
+            else:
+                reply = json.loads(response.read())
+        if "error" in reply:
+            error = reply["error"]
+            raise MCPError(f"{method} failed ({error.get('code')}): {error.get('message')}")
+        return reply["result"]
+
+    def _read_events(self, response: httpx.Response, request_id: int, on_progress) -> dict:
+        for line in response.iter_lines():
+            if not line.startswith("data:"):
+                continue
+            message = json.loads(line[5:])
+            if message.get("id") == request_id:
+                return message
+            if on_progress and message.get("method") == "notifications/progress":
+                progress = message["params"]
+                on_progress(progress["progress"], progress.get("total"), progress.get("message"))
+        raise MCPError(f"no response to request {request_id} in event stream")
+
+
+def normalize_arguments(arguments: dict | None) -> str:
+    """Canonical JSON for `arguments`: sorted keys, strings stripped and whitespace collapsed."""
+    def normalize(value):
+        if isinstance(value, str):
+            return " ".join(value.split())
+        if isinstance(value, dict):
+            return {key: normalize(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [normalize(item) for item in value]
+        return value
+    return json.dumps(normalize(arguments or {}), sort_keys=True, separators=(",", ":"))
+
+
+class ResultCache:
+    def __init__(self, ttl: float = 300, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str], tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name: str, arguments: dict | None) -> tuple[bool, object]:
+        """Return (True, result) for a fresh cached result, else (False, None)."""
+        key = (name, normalize_arguments(arguments))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, name: str, arguments: dict | None, result) -> None:
+        key = (name, normalize_arguments(arguments))
+        with self._lock:
+            self._entries[key] = (time.monotonic(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
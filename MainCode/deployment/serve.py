@@ -0,0 +1,65 @@
+"""Production launcher for the feed server: several uvicorn workers behind one port.
+
+    python MainCode/deployment/serve.py --workers 4 --port 24242
+
+Every worker is a separate process running feed.create_app(). The server is
+stateless_http, so any worker can answer any request. Workers share the SQLite
+feed archive (FEED_ARCHIVE_PATH): one of them fetches each feed per poll
+interval and the others reload from the archive.
+
+With --workers above 1, uvicorn supervises the workers and `kill -HUP <pid>`
+restarts them one by one without dropping the socket, e.g. after editing
+feeds.json; a single worker runs unsupervised and exits on SIGHUP. Each worker
+serves its own /metrics, labelled with its pid (see feed.py). --reload restarts on code changes and is meant
+for development only (single worker). The same factory works under gunicorn:
+
+    gunicorn --chdir MainCode/deployment -w 4 -k uvicorn.workers.UvicornWorker "feed:create_app()"
+"""
+import argparse
+import os
+from pathlib import Path
+
+import uvicorn
+
+DEPLOYMENT_DIR = Path(__file__).resolve().parent
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=os.environ.get("FEED_HOST", "localhost"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("FEED_PORT", "24242")))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("FEED_WORKERS", "1")),
+                        help="worker processes (default: FEED_WORKERS or 1)")
+    parser.add_argument("--keep-alive", type=int, default=int(os.environ.get("FEED_KEEP_ALIVE", "30")),
+                        help="seconds to keep idle client connections open")
+    parser.add_argument("--backlog", type=int, default=2048, help="pending connections the socket queues")
+    parser.add_argument("--graceful-timeout", type=int, default=10,
+                        help="seconds a stopping worker waits for in-flight requests")
+    parser.add_argument("--reload", action="store_true", help="restart on code changes (development only)")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+    if args.reload and args.workers > 1:
+        parser.error("--reload runs a single worker; drop --workers")
+    return args
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    uvicorn.run(
+        "feed:create_app",
+        factory=True,
+        app_dir=str(DEPLOYMENT_DIR),
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        reload=args.reload,
+        reload_dirs=[str(DEPLOYMENT_DIR)] if args.reload else None,
+        timeout_keep_alive=args.keep_alive,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        backlog=args.backlog,
+        log_level=args.log_level,
+    )
+
+
+if __name__ == "__main__":
+    main()
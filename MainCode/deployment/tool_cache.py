@@ -0,0 +1,157 @@
+"""Memoization for pure MCP tools.
+
+Put @cached_tool under @mcp.tool() to opt a tool in:
+
+    @mcp.tool()
+    @cached_tool(maxsize=1024, ttl=60)
+    def add(a: int, b: int) -> int: ...
+
+FastMCP validates the arguments before calling the wrapper, so results are
+keyed on the validated values. Entries are evicted least-recently-used past
+`maxsize` and expire after `ttl` seconds (never, if ttl is None). Errors are
+not cached. Identical concurrent calls to an async tool share one execution.
+Every cached tool is listed in `cached_tools` for stats and invalidation.
+"""
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from fastmcp import Context
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+cached_tools: dict[str, "ToolCache"] = {}
+
+
+def _freeze(value):
+    # Lists and dicts from the validated arguments become hashable tuples.
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(item) for item in value)
+    if hasattr(value, "model_dump"):
+        return _freeze(value.model_dump())
+    return value
+
+
+class ToolCache:
+    def __init__(self, function, maxsize: int, ttl: float | None):
+        self.function = function
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._signature = inspect.signature(function)
+        # Context is per request, so it is never part of the key.
+        self._skip = {
+            name for name, parameter in self._signature.parameters.items()
+            if isinstance(parameter.annotation, type) and issubclass(parameter.annotation, Context)
+        }
+        self._entries: OrderedDict[tuple, tuple[float, object]] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+    def key(self, *args, **kwargs) -> tuple:
+        bound = self._signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return tuple((name, _freeze(value)) for name, value in bound.arguments.items() if name not in self._skip)
+
+    def lookup(self, key: tuple) -> tuple[bool, object]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl is None or time.monotonic() - entry[0] < self.ttl):
+                self._entries.move_to_end(key)
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            return False, None
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def store(self, key: tuple, result) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *args, **kwargs) -> bool:
+        """Drop the entry for these arguments; returns whether there was one."""
+        with self._lock:
+            return self._entries.pop(self.key(*args, **kwargs), None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+def cached_tool(function=None, *, maxsize: int = 1024, ttl: float | None = None, name: str | None = None):
+    """Memoize a pure tool function; see the module docstring."""
+    if function is None:
+        return lambda function: cached_tool(function, maxsize=maxsize, ttl=ttl, name=name)
+
+    cache = ToolCache(function, maxsize, ttl)
+    cached_tools[name or function.__name__] = cache
+
+    if inspect.iscoroutinefunction(function):
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            key = cache.key(*args, **kwargs)
+            hit, result = cache.lookup(key)
+            task = cache._inflight.get(key)
+            # A call that joins an identical one in flight counts as a hit too.
+            cache.record(hit or task is not None)
+            if hit:
+                return result
+            if task is None:
+                task = asyncio.get_running_loop().create_task(function(*args, **kwargs))
+                cache._inflight[key] = task
+                task.add_done_callback(functools.partial(finished, key))
+            # Shielded so one cancelled caller doesn't cancel the call for the others sharing it.
+            return await asyncio.shield(task)
+
+        def finished(key: tuple, task: asyncio.Task) -> None:
+            if cache._inflight.get(key) is task:
+                del cache._inflight[key]
+            if not task.cancelled() and task.exception() is None:
+                cache.store(key, task.result())
+    else:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            key = cache.key(*args, **kwargs)
+            hit, result = cache.lookup(key)
+            cache.record(hit)
+            if hit:
+                return result
+            result = function(*args, **kwargs)
+            cache.store(key, result)
+            return result
+
+    wrapper.cache = cache
+    wrapper.cache_info = cache.info
+    wrapper.cache_clear = cache.clear
+    wrapper.invalidate = cache.invalidate
+    return wrapper
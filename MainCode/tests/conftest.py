@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+# The servers, their modules and the fixture server are plain scripts, not a package.
+MAIN_CODE = Path(__file__).resolve().parent.parent
+sys.path.append(str(MAIN_CODE / "deployment"))
+sys.path.append(str(MAIN_CODE / "benchmark"))
+sys.path.append(str(MAIN_CODE / "Scenario1"))
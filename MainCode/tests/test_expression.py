@@ -0,0 +1,87 @@
+"""The calculator's whitelist expression compiler and the evaluate_expression tool.
+
+    python -m pytest MainCode/tests
+"""
+import pytest
+
+from expression import MAX_EXPRESSION_DEPTH, MAX_EXPRESSION_LENGTH, compile_expression
+from fastmcp_calculator import evaluate_expression
+
+
+def evaluate(expression: str, bindings=None) -> dict:
+    return evaluate_expression.fn(expression, bindings)
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "x.__class__",
+        "(1).real",
+        "__import__('os')",
+        "open('/etc/passwd')",
+        "print(1)",
+        "sqrt.__call__(4)",
+        "(lambda: 1)()",
+        "max(a=1, b=2)",
+        "round(1.25, ndigits=1)",
+        "max(*[1, 2])",
+        "x[0]",
+        "[1, 2]",
+        "'text'",
+        "True",
+        "1 if x else 2",
+        "x < 1",
+        "sqrt",
+        "x := 1",
+    ],
+)
+def test_rejects_syntax_outside_the_whitelist(source):
+    with pytest.raises(ValueError):
+        compile_expression(source)
+
+
+def test_evaluates_variables_constants_and_functions():
+    compiled = compile_expression("(price * qty) * (1 + tax) / 2 + floor(pi) - max(1, 2, 3)")
+    assert compiled.variables == {"price", "qty", "tax"}
+    assert compiled({"price": 2, "qty": 3, "tax": 0.5}) == pytest.approx(4.5)
+    assert compile_expression("log(8, 2)")({}) == pytest.approx(3)
+    assert compile_expression("round(2.345, 2)")({}) == 2.35
+
+
+@pytest.mark.parametrize("source", ["min(1)", "max()", "sqrt(1, 2)", "abs()", "round(1, 2, 3)", "log(1, 2, 3)"])
+def test_checks_arity_when_compiling(source):
+    with pytest.raises(ValueError, match="argument"):
+        compile_expression(source)
+
+
+def test_rejects_deep_and_long_expressions():
+    compile_expression("-" * MAX_EXPRESSION_DEPTH + "1")
+    with pytest.raises(ValueError, match="nested"):
+        compile_expression("-" * (MAX_EXPRESSION_DEPTH + 1) + "1")
+    with pytest.raises(ValueError, match="nested"):
+        compile_expression("1" + "+1" * (MAX_EXPRESSION_DEPTH + 1))
+    with pytest.raises(ValueError, match="longer"):
+        compile_expression("1" * (MAX_EXPRESSION_LENGTH + 1))
+
+
+def test_reports_failures_per_binding():
+    result = evaluate("a / b + sqrt(a)", [{"a": 4, "b": 2}, {"a": 4, "b": 0}, {"a": -4, "b": 1}, {"a": 1}])
+    assert result["results"] == [4.0, None, None, None]
+    assert [error["index"] for error in result["errors"]] == [1, 2, 3]
+    assert result["errors"][0]["error"] == "Cannot divide by zero."
+    assert "Missing value" in result["errors"][2]["error"]
+
+
+@pytest.mark.parametrize(
+    "source, error",
+    [
+        ("1e308 * 10", "Result is too large."),
+        ("exp(1000)", "Result is too large."),
+        ("10 ** 400", "Result is too large."),
+        ("1e308 * 10 - 1e308 * 10", "Result is not a number."),
+        ("(-4) ** 0.5", "Result is not a real number."),
+        ("round(1, 1.5)", "round() needs a whole number of digits."),
+    ],
+)
+def test_non_finite_and_non_real_results_are_null(source, error):
+    assert evaluate(source) == {"results": [None], "errors": [{"index": 0, "error": error}]}
@@ -0,0 +1,217 @@
+"""FeedCache, CircuitBreaker and AdmissionMiddleware against the local fixture server.
+
+    python -m pytest MainCode/tests
+"""
+import asyncio
+
+import pytest
+from fastmcp import Client, FastMCP
+
+import fixture_server
+from feed_admission import AdmissionMiddleware
+from feed_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from feed_cache import FeedCache
+from feed_metrics import Metrics
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = fixture_server.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.fixture
+def base_url(server):
+    yield server
+    fixture_server.set_faults(server, delay=0, error_rate=0)
+
+
+def fetches(metrics: Metrics, result: str) -> int:
+    return int(sum(value for key, value in metrics._counters["feed_fetches_total"].items() if ("result", result) in key))
+
+
+def test_concurrent_misses_share_one_fetch(base_url):
+    url = f"{base_url}/news.xml?delay=0.2"
+
+    async def run():
+        cache = FeedCache(metrics=Metrics())
+        try:
+            feeds = await asyncio.gather(*(cache.get(url) for _ in range(10)))
+        finally:
+            await cache.aclose()
+        return cache, feeds
+
+    cache, feeds = asyncio.run(run())
+    assert fetches(cache.metrics, "ok") == 1
+    assert all(feed is feeds[0] for feed in feeds)
+    assert feeds[0].entries
+
+
+def test_breaker_opens_half_opens_and_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failures=2, slow=1, reset=10, max_reset=15, clock=clock, jitter=lambda: 0.5)
+
+    assert not breaker.record_failure("HTTP 503")
+    assert breaker.state == CLOSED and breaker.allow()
+    assert breaker.record_failure("HTTP 503")
+    assert breaker.state == OPEN and not breaker.allow()
+    assert breaker.retry_in() == 10
+
+    clock.now += 10
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    assert not breaker.allow()  # one probe at a time
+    assert breaker.record_success(2.0)  # slow, so the probe failed
+    assert breaker.state == OPEN and breaker.retry_in() == 15  # doubled, capped at max_reset
+
+    clock.now += 15
+    assert breaker.allow()
+    assert not breaker.record_success(0.1)
+    assert breaker.state == CLOSED and breaker.failures == 0 and breaker.last_error is None
+
+
+def test_open_breaker_serves_stale_copy_until_probe_succeeds(base_url):
+    url = f"{base_url}/news.xml"
+    clock = FakeClock()
+
+    async def run():
+        cache = FeedCache(
+            ttl=0,
+            metrics=Metrics(),
+            breaker_factory=lambda: CircuitBreaker(failures=1, reset=60, clock=clock, jitter=lambda: 0.5),
+        )
+        try:
+            good = await cache.get(url)
+            assert not cache.health(url).stale
+
+            fixture_server.set_faults(base_url, error_rate=1)
+            assert (await cache.refresh(url)).feed is good
+            health = cache.health(url)
+            assert (health.state, health.stale, health.error, health.retry_in) == (OPEN, True, "HTTP 503", 60)
+
+            # Open: answered from the cache without touching the upstream.
+            assert (await cache.refresh(url)).feed is good
+            assert fetches(cache.metrics, "short_circuit") == 1
+
+            fixture_server.set_faults(base_url, error_rate=0)
+            clock.now += 60
+            await cache.refresh(url)
+            health = cache.health(url)
+            assert (health.state, health.stale, health.error) == (CLOSED, False, None)
+        finally:
+            await cache.aclose()
+
+    asyncio.run(run())
+
+
+def test_slow_fetch_opens_breaker_without_marking_stale(base_url):
+    url = f"{base_url}/youtube.xml?delay=0.2"
+
+    async def run():
+        cache = FeedCache(metrics=Metrics(), breaker_factory=lambda: CircuitBreaker(failures=1, slow=0.1))
+        try:
+            await cache.get(url)
+            return cache.health(url)
+        finally:
+            await cache.aclose()
+
+    health = asyncio.run(run())
+    assert health.state == OPEN
+    assert not health.stale
+    assert health.error.startswith("slow response")
+
+
+def admission_server(admission: AdmissionMiddleware, release: asyncio.Event) -> FastMCP:
+    mcp = FastMCP(name="Admission test", middleware=[admission])
+
+    @mcp.tool()
+    async def slow() -> str:
+        await release.wait()
+        return "done"
+
+    @mcp.tool()
+    async def nested() -> str:
+        # Like fcc_multi_call: the inner call goes back through the middleware.
+        try:
+            await mcp._call_tool("slow", {})
+        except Exception as exc:
+            return str(exc)
+        return "done"
+
+    return mcp
+
+
+def rejections(metrics: Metrics, reason: str) -> int:
+    return int(metrics._counters["admission_rejected_total"][(("reason", reason),)])
+
+
+def test_queued_call_times_out():
+    metrics = Metrics()
+    admission = AdmissionMiddleware(metrics, max_concurrent=1, tool_concurrency={}, queue_size=4, queue_timeout=0.2)
+
+    async def run():
+        release = asyncio.Event()
+        async with Client(admission_server(admission, release)) as client:
+            running = asyncio.create_task(client.call_tool("slow"))
+            await asyncio.sleep(0.05)
+            rejected = await client.call_tool("slow", raise_on_error=False)
+            release.set()
+            return rejected, await running
+
+    rejected, admitted = asyncio.run(run())
+    assert rejected.is_error
+    assert "queue_timeout" in rejected.content[0].text
+    assert admitted.data == "done"
+    assert rejections(metrics, "queue_timeout") == 1
+    assert admission.active == admission.waiting == 0
+
+
+def test_full_queue_rejects_immediately():
+    metrics = Metrics()
+    admission = AdmissionMiddleware(metrics, max_concurrent=1, tool_concurrency={}, queue_size=1, queue_timeout=5)
+
+    async def run():
+        release = asyncio.Event()
+        async with Client(admission_server(admission, release)) as client:
+            running = asyncio.create_task(client.call_tool("slow"))
+            await asyncio.sleep(0.05)
+            queued = asyncio.create_task(client.call_tool("slow"))
+            await asyncio.sleep(0.05)
+            assert admission.queue_full
+            rejected = await asyncio.wait_for(client.call_tool("slow", raise_on_error=False), 1)
+            release.set()
+            return rejected, await running, await queued
+
+    rejected, *admitted = asyncio.run(run())
+    assert rejected.is_error
+    assert "queue_full" in rejected.content[0].text
+    assert [result.data for result in admitted] == ["done", "done"]
+    assert rejections(metrics, "queue_full") == 1
+
+
+def test_nested_call_fails_fast_when_its_tool_is_busy():
+    metrics = Metrics()
+    admission = AdmissionMiddleware(metrics, max_concurrent=2, tool_concurrency={"slow": 1}, queue_size=4, queue_timeout=5)
+
+    async def run():
+        release = asyncio.Event()
+        async with Client(admission_server(admission, release)) as client:
+            running = asyncio.create_task(client.call_tool("slow"))
+            await asyncio.sleep(0.05)
+            # Holds the second server-wide slot; waiting for "slow" here could deadlock.
+            nested = await asyncio.wait_for(client.call_tool("nested"), 1)
+            release.set()
+            return nested, await running
+
+    nested, admitted = asyncio.run(run())
+    assert "tool_busy" in nested.data
+    assert admitted.data == "done"
+    assert rejections(metrics, "tool_busy") == 1
@@ -0,0 +1,28 @@
+"""Startup budget of the stdio servers; see benchmark/startup_time.py.
+
+    STARTUP_BUDGET_MS=1500 python -m pytest MainCode/tests
+"""
+import asyncio
+import os
+import statistics
+
+import pytest
+
+from startup_time import SERVERS, handshake_ms, import_profile
+
+BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", "2000"))
+
+
+@pytest.mark.parametrize("name", list(SERVERS))
+def test_heavy_dependencies_load_lazily(name):
+    script, _ = SERVERS[name]
+    _, modules = import_profile(script)
+    assert script.stem in modules
+    assert not {"numpy", "feedparser"} & modules.keys()
+
+
+@pytest.mark.parametrize("name", list(SERVERS))
+def test_initialize_within_budget(name):
+    script, _ = SERVERS[name]
+    median = statistics.median(asyncio.run(handshake_ms(script)) for _ in range(3))
+    assert median <= BUDGET_MS, f"{name} took {median:.0f} ms to initialize (budget {BUDGET_MS:.0f} ms)"
@@ -0,0 +1,52 @@
+"""cached_tool memoization and single-flight for async tools.
+
+    python -m pytest MainCode/tests
+"""
+import asyncio
+
+import pytest
+
+from tool_cache import cached_tool
+
+
+def test_identical_calls_share_one_execution_and_survive_cancellation():
+    calls = []
+
+    @cached_tool(name="test_double")
+    async def double(x: int) -> int:
+        calls.append(x)
+        await asyncio.sleep(0.1)
+        return x * 2
+
+    async def run():
+        first = asyncio.create_task(double(1))
+        second = asyncio.create_task(double(1))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        result = await second
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return result, await double(1)
+
+    assert asyncio.run(run()) == (2, 2)
+    assert calls == [1]
+    assert double.cache_info().hits == 2
+
+
+def test_errors_reach_every_caller_and_are_not_cached():
+    calls = []
+
+    @cached_tool(name="test_fail")
+    async def fail(x: int) -> int:
+        calls.append(x)
+        await asyncio.sleep(0.05)
+        raise ValueError("upstream down")
+
+    async def run():
+        return await asyncio.gather(fail(1), fail(1), return_exceptions=True)
+
+    assert [str(error) for error in asyncio.run(run())] == ["upstream down", "upstream down"]
+    assert fail.cache_info().currsize == 0
+    with pytest.raises(ValueError):
+        asyncio.run(fail(1))
+    assert calls == [1, 1]